@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+# -*- encoding: utf-8; py-indent-offset: 4 -*-
+
+# This is free software;  you can redistribute it and/or modify it
+# under the  terms of the  GNU General Public License  as published by
+# the Free Software Foundation in version 2.  check_mk is  distributed
+# in the hope that it will be useful, but WITHOUT ANY WARRANTY;  with-
+# out even the implied warranty of  MERCHANTABILITY  or  FITNESS FOR A
+# PARTICULAR PURPOSE. See the  GNU General Public License for more de-
+# tails. You should have  received  a copy of the  GNU  General Public
+# License along with GNU Make; see the file  COPYING.  If  not,  write
+# to the Free Software Foundation, Inc., 51 Franklin St,  Fifth Floor,
+# Boston, MA 02110-1301 USA.
+
+# WAGNER AG
+# Developer: opensource@wagner.ch
+
+"""
+Check_MK agent based checks to be used with agent_fortios Datasource
+
+"""
+
+from __future__ import annotations
+
+import json
+from typing import List
+
+from cmk.base.plugins.agent_based.agent_based_api.v1 import (
+    Metric,
+    Result,
+    Service,
+    State,
+    register,
+)
+from cmk.base.plugins.agent_based.agent_based_api.v1.type_defs import CheckResult, DiscoveryResult
+from pydantic import BaseModel
+
+
+class AgentDeadline(BaseModel):
+    deadline: int
+    elapsed: float
+    # sections dropped without any data
+    skipped: List[str] = []
+    # sections not requested in time, served from the agent cache instead
+    cached: List[str] = []
+
+
+def parse_fortios_agent_deadline(string_table) -> AgentDeadline | None:
+    try:
+        json_data = json.loads(string_table[0][0])
+    except (ValueError, IndexError):
+        return None
+
+    return AgentDeadline(**json_data)
+
+
+register.agent_section(
+    name="fortios_agent_deadline",
+    parse_function=parse_fortios_agent_deadline,
+)
+
+
+def discovery_fortios_agent_deadline(section: AgentDeadline) -> DiscoveryResult:
+    yield Service()
+
+
+def check_fortios_agent_deadline(section: AgentDeadline) -> CheckResult:
+    yield Result(state=State.OK, summary=f"Collected in {section.elapsed:.1f}s (deadline: {section.deadline}s)")
+    if section.cached:
+        yield Result(state=State.WARN, summary=f"Served from cache: {', '.join(section.cached)}")
+    if section.skipped:
+        yield Result(state=State.CRIT, summary=f"Dropped: {', '.join(section.skipped)}")
+    yield Metric("fortios_agent_elapsed", section.elapsed, boundaries=(0, section.deadline))
+
+
+register.check_plugin(
+    name="fortios_agent_deadline",
+    service_name="FortiOS agent deadline",
+    discovery_function=discovery_fortios_agent_deadline,
+    check_function=check_fortios_agent_deadline,
+)
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+# -*- encoding: utf-8; py-indent-offset: 4 -*-
+
+# This is free software;  you can redistribute it and/or modify it
+# under the  terms of the  GNU General Public License  as published by
+# the Free Software Foundation in version 2.  check_mk is  distributed
+# in the hope that it will be useful, but WITHOUT ANY WARRANTY;  with-
+# out even the implied warranty of  MERCHANTABILITY  or  FITNESS FOR A
+# PARTICULAR PURPOSE. See the  GNU General Public License for more de-
+# tails. You should have  received  a copy of the  GNU  General Public
+# License along with GNU Make; see the file  COPYING.  If  not,  write
+# to the Free Software Foundation, Inc., 51 Franklin St,  Fifth Floor,
+# Boston, MA 02110-1301 USA.
+
+# WAGNER AG
+# Developer: opensource@wagner.ch
+
+"""
+Check_MK agent based checks to be used with agent_fortios Datasource
+
+"""
+
+from __future__ import annotations
+
+import json
+from typing import Dict, Optional
+
+from cmk.base.plugins.agent_based.agent_based_api.v1 import (
+    Metric,
+    Result,
+    Service,
+    State,
+    register,
+    render,
+)
+from cmk.base.plugins.agent_based.agent_based_api.v1.type_defs import CheckResult, DiscoveryResult
+from pydantic import BaseModel
+
+
+class EndpointStats(BaseModel):
+    name: str
+    path: str
+    status_code: Optional[int] = None
+    latency: float = 0.0
+    wire_bytes: int = 0
+    body_bytes: int = 0
+    decode_time: float = 0.0
+    from_cache: bool = False
+    # seconds since the cached data was collected
+    cache_age: Optional[int] = None
+    # the request failed and the agent fell back to the cached data
+    fallback: bool = False
+    # the FortiGate answered an earlier request with 404 or 424, the agent no longer requests it
+    unsupported: bool = False
+
+    @property
+    def endpoint(self) -> str:
+        return self.path.split("?", 1)[0]
+
+
+Section = Dict[str, EndpointStats]
+
+
+def parse_fortios_agent_stats(string_table) -> Section | None:
+    try:
+        json_data = json.loads(string_table[0][0])
+    except (ValueError, IndexError):
+        return None
+
+    section: Section = {}
+    for entry in json_data.get("sections", []):
+        stats = EndpointStats(**entry)
+        # sections sharing a request report the same stats
+        section.setdefault(stats.endpoint, stats)
+    return section
+
+
+register.agent_section(
+    name="fortios_agent_stats",
+    parse_function=parse_fortios_agent_stats,
+)
+
+
+def discovery_fortios_agent_stats(section: Section) -> DiscoveryResult:
+    for endpoint, stats in section.items():
+        if not stats.unsupported:
+            yield Service(item=endpoint)
+
+
+def check_fortios_agent_stats(item: str, section: Section) -> CheckResult:
+    if (stats := section.get(item)) is None:
+        return
+
+    if stats.unsupported:
+        yield Result(state=State.OK, summary="Not supported by the FortiGate")
+        return
+
+    if stats.fallback:
+        cached = f" of {render.timespan(stats.cache_age)} ago" if stats.cache_age is not None else ""
+        yield Result(state=State.WARN, summary=f"Request failed (HTTP status: {stats.status_code or 'none'}), served from cache{cached}")
+        return
+
+    if stats.from_cache:
+        yield Result(state=State.OK, summary="Served from cache")
+        return
+
+    if stats.status_code is None:
+        yield Result(state=State.WARN, summary="Not requested")
+        return
+
+    yield Result(state=State.OK if stats.status_code == 200 else State.WARN, summary=f"HTTP status: {stats.status_code}")
+    yield Result(state=State.OK, summary=f"Latency: {stats.latency * 1000:.0f} ms")
+    yield Result(state=State.OK, summary=f"Received: {render.bytes(stats.wire_bytes)} ({render.bytes(stats.body_bytes)} decoded)")
+    yield Result(state=State.OK, notice=f"Decode time: {stats.decode_time * 1000:.1f} ms")
+    yield Metric("fortios_api_latency", stats.latency)
+    yield Metric("fortios_api_wire_bytes", stats.wire_bytes)
+    yield Metric("fortios_api_body_bytes", stats.body_bytes)
+    yield Metric("fortios_api_decode_time", stats.decode_time)
+
+
+register.check_plugin(
+    name="fortios_agent_stats",
+    service_name="FortiOS API %s",
+    discovery_function=discovery_fortios_agent_stats,
+    check_function=check_fortios_agent_stats,
+)
@@ -22,14 +22,19 @@ Check_MK agent based checks to be used with agent_fortios Datasource
 
 from __future__ import annotations
 
+import ipaddress
 import json
-from typing import Mapping, Optional
+from array import array
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Mapping, Optional
 
 from cmk.base.plugins.agent_based.agent_based_api.v1 import (
     register,
 )
 from pydantic import BaseModel
 
+from .utils.fortios import construct_model, validate_sections
+
 
 class DhcpLease(BaseModel):
     ip: Optional[str]
@@ -45,7 +50,116 @@ class DhcpLease(BaseModel):
     server_ipam_enabled: bool
 
 
-def parse_fortios_dhcp_lease(string_table) -> Mapping[str, DhcpLease] | None:
+class ServerLeases(BaseModel):
+    count: int = 0
+    statuses: Dict[str, int] = {}
+    conflicted: List[DhcpLease] = []
+
+
+def _pack_ip(ip: Optional[str]) -> int:
+    # 0 for leases without a valid IPv4 address
+    try:
+        return int(ipaddress.IPv4Address(ip))
+    except (ipaddress.AddressValueError, TypeError):
+        return 0
+
+
+_NO_MAC = bytes(6)
+
+
+def _pack_mac(mac: Optional[str]) -> bytes:
+    # six zero bytes for anything that is not a 48 bit MAC address
+    try:
+        packed = bytes.fromhex(mac.replace(":", "").replace("-", ""))
+    except (AttributeError, ValueError):
+        return _NO_MAC
+    return packed if len(packed) == len(_NO_MAC) else _NO_MAC
+
+
+def _intern(values: List[Optional[str]], codes: Dict[Optional[str], int], value: Optional[str]) -> int:
+    if (code := codes.get(value)) is None:
+        code = codes[value] = len(values)
+        values.append(value)
+    return code
+
+
+class DhcpLeaseSection:
+    """
+    All DHCP leases of the FortiGate in columns, one row per lease in the order of the REST API.
+    IPv4 addresses are packed into integers and the MAC addresses into six bytes per lease, status
+    and interface are stored as indexes into the lists of the distinct values.
+    """
+
+    def __init__(self) -> None:
+        self.ip = array("I")
+        self.mac = bytearray()
+        self.expire_time = array("q")
+        self.server_mkey = array("i")
+        self.reserved = array("B")
+        self.status = array("B")
+        self.interface = array("H")
+        self.statuses: List[Optional[str]] = []
+        self.interfaces: List[Optional[str]] = []
+        # aggregated once per DHCP server (server_mkey) for the scope checks
+        self.servers: Dict[int, ServerLeases] = {}
+
+    @classmethod
+    def from_leases(cls, leases: Iterable[Mapping[str, Any]]) -> DhcpLeaseSection:
+        section = cls()
+        status_codes: Dict[Optional[str], int] = {}
+        interface_codes: Dict[Optional[str], int] = {}
+        conflicted: Dict[int, List[DhcpLease]] = {}
+        for lease in leases:
+            section.ip.append(_pack_ip(lease.get("ip")))
+            section.mac += _pack_mac(lease.get("mac"))
+            section.expire_time.append(lease.get("expire_time") or 0)
+            section.server_mkey.append(lease["server_mkey"])
+            section.reserved.append(bool(lease.get("reserved")))
+            section.status.append(_intern(section.statuses, status_codes, lease.get("status")))
+            section.interface.append(_intern(section.interfaces, interface_codes, lease.get("interface")))
+            if lease.get("status") == "conflicted":
+                conflicted.setdefault(lease["server_mkey"], []).append(construct_model(DhcpLease, lease))
+
+        for (server_mkey, status), count in Counter(zip(section.server_mkey, section.status, strict=True)).items():
+            if (server := section.servers.get(server_mkey)) is None:
+                server = section.servers[server_mkey] = ServerLeases(conflicted=conflicted.get(server_mkey, []))
+            server.count += count
+            server.statuses[section.statuses[status]] = count
+        return section
+
+    def __len__(self) -> int:
+        return len(self.server_mkey)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, DhcpLeaseSection):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in vars(self))
+
+    def __repr__(self) -> str:
+        return f"DhcpLeaseSection(leases={len(self)}, servers={self.servers!r})"
+
+    def ip_address(self, row: int) -> Optional[str]:
+        return str(ipaddress.IPv4Address(self.ip[row])) if self.ip[row] else None
+
+    def mac_address(self, row: int) -> Optional[str]:
+        mac = self.mac[row * len(_NO_MAC) : (row + 1) * len(_NO_MAC)]
+        return mac.hex(":") if mac != _NO_MAC else None
+
+    def interface_name(self, row: int) -> Optional[str]:
+        return self.interfaces[self.interface[row]]
+
+    def expiring(self, server_mkey: int, before: int) -> int:
+        """
+        Number of leases of the DHCP server that expire before the given time, reserved leases never expire.
+        """
+        return sum(
+            1
+            for mkey, expire_time, reserved in zip(self.server_mkey, self.expire_time, self.reserved, strict=True)
+            if mkey == server_mkey and not reserved and 0 < expire_time < before
+        )
+
+
+def parse_fortios_dhcp_lease(string_table) -> DhcpLeaseSection | None:
     try:
         json_data = json.loads(string_table[0][0])
     except (ValueError, IndexError):
@@ -54,7 +168,10 @@ def parse_fortios_dhcp_lease(string_table) -> Mapping[str, DhcpLease] | None:
     if (forti_dhcp_lease := json_data.get("results")) in ({}, []):
         return None
 
-    return {item["mac"]: DhcpLease(**item) for item in forti_dhcp_lease}
+    if validate_sections():
+        for item in forti_dhcp_lease:
+            DhcpLease.parse_obj(item)
+    return DhcpLeaseSection.from_leases(forti_dhcp_lease)
 
 
 register.agent_section(
@@ -23,7 +23,6 @@ Check_MK agent based checks to be used with agent_fortios Datasource
 from __future__ import annotations
 
 import ipaddress
-import json
 from typing import Any, Dict, List, Mapping
 
 from cmk.base.plugins.agent_based.agent_based_api.v1 import (
@@ -40,9 +39,15 @@ from cmk.base.plugins.agent_based.agent_based_api.v1.render import (
 from cmk.base.plugins.agent_based.agent_based_api.v1.type_defs import CheckResult, DiscoveryResult
 from pydantic import BaseModel
 
+from .utils.fortios import loads_normalized, parse_model
+
 DEFAULT_DHCP_LEVELS: Dict = {"dhcp_scope_levels": (80.0, 90.0)}
 
 
+def _range_size(start_ip: str, end_ip: str) -> int:
+    return int(ipaddress.IPv4Address(end_ip)) - int(ipaddress.IPv4Address(start_ip)) + 1
+
+
 class IpRange(BaseModel):
     id: int
     q_origin_key: int
@@ -53,6 +58,8 @@ class IpRange(BaseModel):
     uci_match: str
     uci_string: List[str]
     lease_time: int
+    # set by parse_fortios_dhcp_scope
+    size: int = 0
 
 
 class VciString(BaseModel):
@@ -126,32 +133,30 @@ class DhcpServer(BaseModel):
     vci_string: List[VciString]
     exclude_range: List[str]
     reserved_address: List[ReservedAddress]
+    # the addresses of all ranges, set by parse_fortios_dhcp_scope
+    ip_count: int = 0
 
     @property
     def summary(self) -> str:
         return f"Status: {self.status}, Interface: {self.interface}"
 
 
-def replace_hyphens(d):
-    if isinstance(d, dict):
-        return {k.replace("-", "_"): replace_hyphens(v) for k, v in d.items()}
-    elif isinstance(d, list):
-        return [replace_hyphens(item) for item in d]
-    else:
-        return d
-
-
 def parse_fortios_dhcp_scope(string_table) -> Mapping[str, DhcpServer]:
     try:
-        json_data = json.loads(string_table[0][0])
-        json_data = replace_hyphens(json_data)
+        json_data = loads_normalized(string_table[0][0])
     except (ValueError, IndexError):
         return None
 
     if (forti_dhcp_scope := json_data.get("results")) in ({}, []):
         return None
-    
-    return {str(ipaddress.IPv4Network(f"{item['default_gateway']}/{item['netmask']}", strict=False)): DhcpServer(**item) for item in forti_dhcp_scope}
+
+    section = {str(ipaddress.IPv4Network(f"{item['default_gateway']}/{item['netmask']}", strict=False)): parse_model(DhcpServer, item) for item in forti_dhcp_scope}
+    # computed once per parse, the checks of all scopes only read them
+    for server in section.values():
+        for ip_range in server.ip_range:
+            ip_range.size = _range_size(ip_range.start_ip, ip_range.end_ip)
+        server.ip_count = sum(ip_range.size for ip_range in server.ip_range)
+    return section
 
 
 register.agent_section(
@@ -170,20 +175,13 @@ def check_fortios_dhcp_scope(item: str, params: Mapping[str, Any], section_forti
 
     scope = section_fortios_dhcp_scope.get(item)
     
-    total_ip_count = []
-    for ip_range in scope.ip_range:
-        total_ip_count.append(int(ipaddress.IPv4Address(ip_range.end_ip)) - int(ipaddress.IPv4Address(ip_range.start_ip)) + 1)
-    total_ip_count = sum(total_ip_count)
+    total_ip_count = scope.ip_count
 
     used_ip_count = 0
     conflicted_details = []
-    if section_fortios_dhcp_lease:
-        for lease in section_fortios_dhcp_lease:
-            lease_data = section_fortios_dhcp_lease.get(lease)
-            if scope.q_origin_key == lease_data.server_mkey:
-                used_ip_count += 1
-                if lease_data.status == "conflicted":
-                    conflicted_details.append(str(f"MAC: {lease_data.mac}, IP: {lease_data.ip}"))
+    if section_fortios_dhcp_lease and (server_leases := section_fortios_dhcp_lease.servers.get(scope.q_origin_key)):
+        used_ip_count = server_leases.count
+        conflicted_details = [f"MAC: {lease.mac}, IP: {lease.ip}" for lease in server_leases.conflicted]
 
     if conflicted_details:
         details = "Conflicted leases:\n"
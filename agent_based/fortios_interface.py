@@ -46,6 +46,8 @@ from cmk.base.plugins.agent_based.agent_based_api.v1.render import (
 from cmk.base.plugins.agent_based.agent_based_api.v1.type_defs import CheckResult, DiscoveryResult
 from pydantic import BaseModel, validator
 
+from .utils.fortios import construct_model, validate_sections
+
 
 class Interface(BaseModel):
     id: Optional[str] = None
@@ -123,12 +125,30 @@ class Duplex(IntEnum):
 DISCOVERY_DEFAULT_PARAMETERS = dict({"fortios_interface_excluded": [], "item_discovery_link_status": False, "item_excluded_by_type": "index"})
 
 
+def _construct_interface(data: Mapping[str, Any], vdom: str) -> Interface:
+    # the conversions of the Interface validators
+    speed = data.get("speed")
+    return construct_model(
+        Interface,
+        {
+            **data,
+            "vdom": vdom,
+            "speed": speed * 125000 if speed is not None else None,
+            "if_out_bps": data["tx_bytes"] * 8,
+            "if_in_bps": data["rx_bytes"] * 8,
+        },
+    )
+
+
 def parse_fortios_interfaces(string_table):
     try:
         json_data = json.loads(string_table[0][0])
     except (ValueError, IndexError):
         return None
 
+    if not validate_sections():
+        return {name: _construct_interface(interface, vdom_data["vdom"]) for vdom_data in json_data for name, interface in vdom_data["results"].items()}
+
     data = VdomDataList.parse_obj(json_data)
 
     combined_results = {}
@@ -22,7 +22,6 @@ Check_MK agent based checks to be used with agent_fortios Datasource
 
 from __future__ import annotations
 
-import json
 import time
 from collections.abc import Mapping, Sequence
 from typing import Any, Optional
@@ -41,6 +40,8 @@ from cmk.base.plugins.agent_based.agent_based_api.v1.render import networkbandwi
 from cmk.base.plugins.agent_based.agent_based_api.v1.type_defs import CheckResult, DiscoveryResult
 from pydantic import BaseModel, validator
 
+from .utils.fortios import loads_normalized
+
 
 class Proxy(BaseModel):
     port: int
@@ -103,19 +104,6 @@ class FortiIPSec(BaseModel):
         return f"Type: {self.type}"
 
 
-def replace_hyphens(d):
-    if isinstance(d, dict):
-        new_dict = {}
-        for k, v in d.items():
-            new_key = k.replace("-", "_")
-            new_dict[new_key] = replace_hyphens(v)
-        return new_dict
-    elif isinstance(d, list):
-        return [replace_hyphens(item) for item in d]
-    else:
-        return d
-
-
 def get_ignored_tunnels(ipsec_tunnel, tunnel_ignored_names: list, tunnel_ignored_dst_subnet: list):
     ignored_tunnels = []
 
@@ -135,13 +123,13 @@ def get_ignored_tunnels(ipsec_tunnel, tunnel_ignored_names: list, tunnel_ignored
 
 def parse_fortios_ipsec(string_table) -> Mapping[str, FortiIPSec] | None:
     try:
-        json_data = json.loads(string_table[0][0])
+        json_data = loads_normalized(string_table[0][0])
     except ValueError:
         json_data = None
     if (forti_ipsec_tunnels := json_data[0].get("results")) in ({}, []):
         return None
 
-    return {item["name"]: FortiIPSec(**item) for item in replace_hyphens(forti_ipsec_tunnels)}
+    return {item["name"]: FortiIPSec(**item) for item in forti_ipsec_tunnels}
 
 
 def discovery_fortios_ipsec(section: Mapping[str, FortiIPSec]) -> DiscoveryResult:
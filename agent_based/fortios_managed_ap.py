@@ -43,6 +43,8 @@ from cmk.base.plugins.agent_based.agent_based_api.v1.render import (
 from cmk.base.plugins.agent_based.agent_based_api.v1.type_defs import CheckResult, DiscoveryResult
 from pydantic import BaseModel
 
+from .utils.fortios import parse_models
+
 
 class WiredInterface(BaseModel):
     interface: str
@@ -204,7 +206,7 @@ def parse_fortios_managed_ap(string_table) -> Mapping[str, AccessPoint] | None:
     if (forti_aps := json_data.get("results")) in ({}, []):
         return None
 
-    return {item["name"]: AccessPoint(**item) for item in forti_aps}
+    return parse_models(AccessPoint, forti_aps, "name")
 
 
 register.agent_section(
@@ -22,14 +22,14 @@ Check_MK agent based checks to be used with agent_fortios Datasource
 
 from __future__ import annotations
 
-import json
-
 from cmk.base.plugins.agent_based.agent_based_api.v1 import (
     register,
     render,
 )
 from pydantic import BaseModel
 
+from .utils.fortios import loads_normalized
+
 
 class TimeUnit(BaseModel):
     unit: str
@@ -98,26 +98,13 @@ class FortiosSwitchData(BaseModel):
         return minutes + hours + days
 
 
-def replace_hyphens(d):
-    if isinstance(d, dict):
-        new_dict = {}
-        for k, v in d.items():
-            new_key = k.replace("-", "_")
-            new_dict[new_key] = replace_hyphens(v)
-        return new_dict
-    elif isinstance(d, list):
-        return [replace_hyphens(item) for item in d]
-    else:
-        return d
-
-
 def parse_fortios_managed_switch_health(string_table) -> FortiosSwitchData | None:
     try:
-        json_data = json.loads(string_table[0][0])
+        switch_health = loads_normalized(string_table[0][0])
     except (ValueError, IndexError):
         return None
 
-    if (switch_health := replace_hyphens(json_data)) is None:
+    if switch_health is None:
         return None
 
     PerformanceStatus.update_forward_refs()
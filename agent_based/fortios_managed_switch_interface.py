@@ -22,7 +22,6 @@ Check_MK agent based checks to be used with agent_fortios Datasource
 
 from __future__ import annotations
 
-import json
 import re
 import time
 from enum import IntEnum
@@ -45,6 +44,8 @@ from cmk.base.plugins.agent_based.agent_based_api.v1.render import (
 from cmk.base.plugins.agent_based.agent_based_api.v1.type_defs import CheckResult, DiscoveryResult
 from pydantic import BaseModel
 
+from .utils.fortios import loads_normalized, parse_models
+
 
 class IgmpSnoopingGroup(BaseModel):
     group_count: int
@@ -193,48 +194,39 @@ class Power(IntEnum):
 DISCOVERY_DEFAULT_PARAMETERS = dict({"fortios_switch_interface_discovered": []})
 
 
-def replace_hyphens(d):
-    if isinstance(d, dict):
-        return {k.replace("-", "_"): replace_hyphens(v) for k, v in d.items()}
-    elif isinstance(d, list):
-        return [replace_hyphens(item) for item in d]
-    else:
-        return d
+def join_port_data(all_port_status: list[dict[str, Any]], all_port_stats: Mapping[str, Mapping[str, Any]], all_ports: list[Mapping[str, Any]]) -> None:
+    """Add the statistics and the status of each port to its configuration, both are looked up by port name"""
+    ports_by_interface = {data.get("interface"): data for data in all_ports}
+    for status in all_port_status:
+        port_name = status.get("port_name")
+        if (stats := all_port_stats.get(port_name)) is not None:
+            status.update(stats)
+
+        if (data := ports_by_interface.get(port_name)) is not None:
+            for attr, value in data.items():
+                if attr not in ("vlan", "poe_capable", "poe_status"):
+                    status["port_status" if attr == "status" else attr] = value
 
 
 def parse_fortios_switch_interface(string_table) -> Mapping[str, PhysicalPort] | None:
     try:
-        json_data = json.loads(string_table[0][0])
+        json_data = loads_normalized(string_table[0][0])
 
         if (port_stats := json_data.get("switch_port_stats")) is not None:
-            all_port_stats = replace_hyphens(port_stats.get("ports"))
+            all_port_stats = port_stats.get("ports")
 
         if (port_details := json_data.get("switch_status")) is not None:
-            all_port_status = replace_hyphens(port_details.get("ports"))
+            all_port_status = port_details.get("ports")
 
         if (ports := json_data.get("switch_ports")) is not None:
-            all_ports = replace_hyphens(ports.get("ports"))
-
-        for status in all_port_status:
-            port_name = status.get("port_name")
-            for port, stats in all_port_stats.items():
-                if port == port_name:
-                    for attribute in stats:
-                        status[attribute] = stats[attribute]
-
-            for data in all_ports:
-                if port_name == (data.get("interface")):
-                    for attr in data:
-                        if attr not in ["vlan", "poe_capable", "poe_status"]:
-                            if attr == "status":
-                                status["port_status"] = data.get(attr)
-                            else:
-                                status[attr] = data.get(attr)
+            all_ports = ports.get("ports")
+
+        join_port_data(all_port_status, all_port_stats, all_ports)
 
     except (ValueError, IndexError):
         return None
     
-    return {item["port_name"]: PhysicalPort(**item) for item in all_port_status}
+    return parse_models(PhysicalPort, all_port_status, "port_name")
 
 
 def discovery_fortios_switch_interface(params: Mapping[str, Any], section: Mapping[str, PhysicalPort]) -> DiscoveryResult:
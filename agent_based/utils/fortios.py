@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+# -*- encoding: utf-8; py-indent-offset: 4 -*-
+
+# This is free software;  you can redistribute it and/or modify it
+# under the  terms of the  GNU General Public License  as published by
+# the Free Software Foundation in version 2.  check_mk is  distributed
+# in the hope that it will be useful, but WITHOUT ANY WARRANTY;  with-
+# out even the implied warranty of  MERCHANTABILITY  or  FITNESS FOR A
+# PARTICULAR PURPOSE. See the  GNU General Public License for more de-
+# tails. You should have  received  a copy of the  GNU  General Public
+# License along with GNU Make; see the file  COPYING.  If  not,  write
+# to the Free Software Foundation, Inc., 51 Franklin St,  Fifth Floor,
+# Boston, MA 02110-1301 USA.
+
+# WAGNER AG
+# Developer: opensource@wagner.ch
+
+"""
+Helpers shared by the FortiOS agent based checks
+
+"""
+
+from __future__ import annotations
+
+import json
+from functools import lru_cache
+from typing import Any, Mapping, Optional, Sequence, Tuple, Type, TypeVar, Union, get_args, get_origin
+
+from cmk.utils import debug
+from pydantic import BaseModel
+from pydantic.fields import SHAPE_DICT, SHAPE_LIST, SHAPE_MAPPING, SHAPE_SEQUENCE, SHAPE_SINGLETON, ModelField
+
+Model = TypeVar("Model", bound=BaseModel)
+
+_SCALAR_TYPES = (str, int, float, bool)
+
+# the strings and numbers pydantic accepts for a bool field
+_BOOL_VALUES = {
+    **dict.fromkeys((0, "0", "off", "f", "false", "n", "no"), False),
+    **dict.fromkeys((1, "1", "on", "t", "true", "y", "yes"), True),
+}
+
+# (alias, nested model, pydantic shape, scalar type) of every field of a model
+_FieldPlan = Tuple[Tuple[str, Optional[Type[BaseModel]], int, Optional[type]], ...]
+
+
+def _scalar_type(field: ModelField) -> Optional[type]:
+    # a Union is coerced to its first member like pydantic tries them in order
+    field_type = get_args(field.type_)[0] if get_origin(field.type_) is Union else field.type_
+    return field_type if field.shape == SHAPE_SINGLETON and field_type in _SCALAR_TYPES else None
+
+
+@lru_cache(maxsize=None)
+def _field_plan(model: Type[BaseModel]) -> _FieldPlan:
+    return tuple(
+        (
+            field.alias,
+            field.type_ if isinstance(field.type_, type) and issubclass(field.type_, BaseModel) else None,
+            field.shape,
+            _scalar_type(field),
+        )
+        for field in model.__fields__.values()
+    )
+
+
+def _construct_value(model: Type[BaseModel], shape: int, value: Any) -> Any:
+    if value is None:
+        return None
+    if shape == SHAPE_SINGLETON:
+        return construct_model(model, value)
+    if shape in (SHAPE_LIST, SHAPE_SEQUENCE):
+        return [construct_model(model, item) for item in value]
+    if shape in (SHAPE_DICT, SHAPE_MAPPING):
+        return {key: construct_model(model, item) for key, item in value.items()}
+    return value
+
+
+def _coerce_scalar(scalar: type, value: Any) -> Any:
+    # the same conversions pydantic does, anything else raises ValueError
+    if scalar is bool:
+        try:
+            return _BOOL_VALUES[value.lower() if isinstance(value, str) else value]
+        except (KeyError, TypeError) as e:
+            raise ValueError(f"{value!r} is not a valid boolean") from e
+    if scalar is str and not isinstance(value, (int, float)):
+        raise ValueError(f"{value!r} is not a valid string")
+    return scalar(value)
+
+
+def construct_model(model: Type[Model], data: Mapping[str, Any]) -> Model:
+    """Build a model from trusted agent data without running the pydantic validation
+
+    Nested models are constructed and plain scalars are coerced to the field type, unknown
+    keys are dropped like the validated model does. Data that cannot be coerced is
+    validated instead. Validators are not run, callers have to apply their conversions
+    themselves.
+    """
+    values = {}
+    try:
+        for alias, nested, shape, scalar in _field_plan(model):
+            if alias in data:
+                value = data[alias]
+                if nested is not None:
+                    value = _construct_value(nested, shape, value)
+                elif scalar is not None and value is not None and type(value) is not scalar:
+                    value = _coerce_scalar(scalar, value)
+                values[alias] = value
+    except (TypeError, ValueError):
+        return model.parse_obj(data)
+    return model.construct(**values)
+
+
+def validate_sections() -> bool:
+    """The sections are fully validated in debug mode only, the agent output is trusted otherwise"""
+    return debug.enabled()
+
+
+def parse_model(model: Type[Model], data: Mapping[str, Any]) -> Model:
+    return model.parse_obj(data) if validate_sections() else construct_model(model, data)
+
+
+def parse_models(model: Type[Model], items: Sequence[Mapping[str, Any]], key: str) -> dict[str, Model]:
+    if validate_sections():
+        return {item[key]: model.parse_obj(item) for item in items}
+    return {item[key]: construct_model(model, item) for item in items}
+
+
+class _NormalizedKeys(dict):
+    """FortiOS keys with the hyphens replaced by underscores, translated once per distinct key"""
+
+    def __missing__(self, key: str) -> str:
+        if len(self) >= _MAX_NORMALIZED_KEYS:
+            # keys that are names, e.g. of switch ports, must not grow the memo without bounds
+            self.clear()
+        normalized = self[key] = key.replace("-", "_")
+        return normalized
+
+
+_MAX_NORMALIZED_KEYS = 10000
+_NORMALIZED_KEYS = _NormalizedKeys()
+
+
+def _normalized_object(pairs: list[tuple[str, Any]]) -> dict[str, Any]:
+    keys = _NORMALIZED_KEYS
+    return {keys[key]: value for key, value in pairs}
+
+
+def loads_normalized(text: str) -> Any:
+    """Decode FortiOS JSON with the hyphens in all keys replaced by underscores while decoding"""
+    return json.loads(text, object_pairs_hook=_normalized_object)
+
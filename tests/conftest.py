@@ -0,0 +1,32 @@
+#!/usr/bin/env python3
+# -*- encoding: utf-8; py-indent-offset: 4 -*-
+
+# This is free software;  you can redistribute it and/or modify it
+# under the  terms of the  GNU General Public License  as published by
+# the Free Software Foundation in version 2.  check_mk is  distributed
+# in the hope that it will be useful, but WITHOUT ANY WARRANTY;  with-
+# out even the implied warranty of  MERCHANTABILITY  or  FITNESS FOR A
+# PARTICULAR PURPOSE. See the  GNU General Public License for more de-
+# tails. You should have  received  a copy of the  GNU  General Public
+# License along with GNU Make; see the file  COPYING.  If  not,  write
+# to the Free Software Foundation, Inc., 51 Franklin St,  Fifth Floor,
+# Boston, MA 02110-1301 USA.
+
+# WAGNER AG
+# Developer: opensource@wagner.ch
+
+import pytest
+
+
+def pytest_configure(config) -> None:
+    config.addinivalue_line("markers", "benchmark: timing based scaling test, only run with -m benchmark")
+
+
+def pytest_collection_modifyitems(config, items) -> None:
+    # timings depend on the load of the machine, the benchmarks are run on request only
+    if "benchmark" in (config.option.markexpr or ""):
+        return
+    skip = pytest.mark.skip(reason="benchmark, run with -m benchmark")
+    for item in items:
+        if "benchmark" in item.keywords:
+            item.add_marker(skip)
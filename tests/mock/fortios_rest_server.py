@@ -0,0 +1,761 @@
+#!/usr/bin/env python3
+# -*- encoding: utf-8; py-indent-offset: 4 -*-
+
+# This is free software;  you can redistribute it and/or modify it
+# under the  terms of the  GNU General Public License  as published by
+# the Free Software Foundation in version 2.  check_mk is  distributed
+# in the hope that it will be useful, but WITHOUT ANY WARRANTY;  with-
+# out even the implied warranty of  MERCHANTABILITY  or  FITNESS FOR A
+# PARTICULAR PURPOSE. See the  GNU General Public License for more de-
+# tails. You should have  received  a copy of the  GNU  General Public
+# License along with GNU Make; see the file  COPYING.  If  not,  write
+# to the Free Software Foundation, Inc., 51 Franklin St,  Fifth Floor,
+# Boston, MA 02110-1301 USA.
+
+# WAGNER AG
+# Developer: opensource@wagner.ch
+
+"""
+Local stand-in for the FortiOS REST API to load test agent_fortios without hardware.
+
+All endpoints of the agent are served from a synthetic, reproducible FortiGate that can be
+scaled with the command line options, e.g.
+
+    ./tests/mock/fortios_rest_server.py --vdoms 4 --interfaces 200 --switches 20 --ports 48 \\
+        --access-points 100 --dhcp-leases 20000 --ipsec-tunnels 50 --ipsec-selectors 20 \\
+        --latency 0.05 --error-rate 0.01
+
+    ./agents/special/agent_fortios --port 8443 --no-cert-check --api-token any 127.0.0.1
+
+Without --cert-file, a self-signed certificate is created with the openssl command.
+"""
+
+from __future__ import annotations
+
+import argparse
+import gzip
+import ipaddress
+import json
+import random
+import signal
+import ssl
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import zlib
+from collections.abc import Callable, Mapping, Sequence
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlsplit
+
+_VERSION = "v7.2.8"
+_BUILD = 1639
+
+
+@dataclass(frozen=True)
+class FleetConfig:
+    vdoms: int = 1
+    # per VDOM
+    interfaces: int = 10
+    ipsec_tunnels: int = 2
+    # phase-2 selectors per tunnel
+    ipsec_selectors: int = 2
+    switches: int = 2
+    ports: int = 24
+    access_points: int = 2
+    dhcp_leases: int = 50
+    # CPU load per VDOM in percent, random if None
+    cpu: int | None = None
+    seed: int = 0
+
+
+def _mac(rng: random.Random) -> str:
+    return ":".join(f"{rng.randrange(256):02x}" for _ in range(6))
+
+
+def _network(index: int) -> ipaddress.IPv4Network:
+    # one /24 per index, 10.0.0.0/8 holds 65536 of them
+    return ipaddress.IPv4Network((0x0A000000 + (index % 65536) * 256, 24))
+
+
+def _subnet_range(network: ipaddress.IPv4Network) -> str:
+    return f"{network.network_address}-{network.broadcast_address}"
+
+
+class SyntheticFortiGate:
+    """
+    Builds the payloads of all endpoints once, every request is served from them.
+    The same config and seed always give the same FortiGate.
+    """
+
+    def __init__(self, config: FleetConfig, serial: str = "FGSYNTH000000001") -> None:
+        self.config = config
+        self.serial = serial
+        self.revision = f"{config.seed:032x}"
+        self.vdom_names = ["root", *(f"VDOM{index:02d}" for index in range(1, config.vdoms))]
+        self._rng = random.Random(config.seed)
+        self._switches = self._build_switches()
+        self._routes: Mapping[str, Callable[[str], object]] = {
+            "monitor/license/status": self._license,
+            "monitor/system/ntp/status": self._ntp,
+            "monitor/vpn/ipsec": self._ipsec,
+            "monitor/web-ui/state/select": self._uptime,
+            "monitor/system/ha-history": self._ha_history,
+            "monitor/system/ha-peer": self._ha_peer,
+            "monitor/system/interface": self._interfaces,
+            "cmdb/system/interface": self._interfaces_cmdb,
+            "monitor/system/vdom-resource": self._vdom_resource,
+            "monitor/router/bgp/neighbors": self._bgp_neighbors,
+            "monitor/system/status": self._system_status,
+            "monitor/vpn/ssl": self._sslvpn,
+            "monitor/switch-controller/managed-switch/status": self._switch_status,
+            "monitor/switch-controller/managed-switch/port-stats": self._switch_port_stats,
+            "cmdb/switch-controller/managed-switch": self._switch_cmdb,
+            "monitor/switch-controller/managed-switch/health": self._switch_health,
+            "monitor/wifi/managed_ap": self._managed_aps,
+            "cmdb/system.dhcp/server": self._dhcp_servers,
+            "monitor/system/dhcp": self._dhcp_leases,
+            "monitor/system/sensor-info": self._sensors,
+        }
+        # the results never change, build them on first use
+        self._results: dict[tuple[str, str], object] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def paths(self) -> Sequence[str]:
+        return list(self._routes)
+
+    def results(self, path: str, vdom: str) -> object:
+        with self._lock:
+            if (path, vdom) not in self._results:
+                self._results[path, vdom] = self._routes[path](vdom)
+            return self._results[path, vdom]
+
+    def response(self, path: str, params: Mapping[str, str]) -> tuple[int, object]:
+        """
+        The status code and the body of a GET request on /api/v2/<path>.
+        """
+        if path not in self._routes:
+            return 404, {"http_status": 404, "status": "error", "serial": self.serial, "version": _VERSION, "build": _BUILD}
+
+        if params.get("vdom") == "*":
+            return 200, [self._envelope(path, vdom, params) for vdom in self.vdom_names]
+        return 200, self._envelope(path, params.get("vdom", "root"), params)
+
+    def _envelope(self, path: str, vdom: str, params: Mapping[str, str]) -> Mapping[str, object]:
+        results = self.results(path, vdom)
+        *parent, name = path.split("/")
+        envelope: dict[str, object] = {
+            "http_method": "GET",
+            "vdom": vdom,
+            "path": parent[-1],
+            "name": name,
+            "action": "",
+            "status": "success",
+            "serial": self.serial,
+            "version": _VERSION,
+            "build": _BUILD,
+        }
+        if not isinstance(results, list):
+            envelope["results"] = results
+            return envelope
+
+        start = int(params.get("start", 0))
+        count = int(params["count"]) if "count" in params else len(results)
+        page = results[start : start + count]
+        if path.startswith("cmdb/"):
+            if fields := params.get("format"):
+                # FortiOS always returns the key of the table entry
+                keep = {"q_origin_key", *fields.split("|")}
+                page = [{key: value for key, value in entry.items() if key in keep} for entry in page]
+            envelope |= {"revision": self.revision, "size": len(page), "matched_count": len(results), "next_idx": start + len(page) - 1}
+        envelope["results"] = page
+        return envelope
+
+    def _build_switches(self) -> list[Mapping[str, object]]:
+        return [{"name": f"SW{index:03d}", "serial": f"S448EFTF{index:08d}", "mac_base": _mac(self._rng)} for index in range(self.config.switches)]
+
+    def _license(self, vdom: str) -> object:
+        expires = int(time.time()) + 180 * 86400
+        downloaded = {
+            "type": "downloaded_fds_object",
+            "status": "licensed",
+            "version": "91.08942",
+            "expires": expires,
+            "entitlement": "AVDB",
+            "last_update": expires - 200 * 86400,
+            "last_update_attempt": int(time.time()) - 3600,
+            "last_update_result_status": "no_updates",
+            "last_update_method_status": "scheduled",
+        }
+        return {
+            "fortiguard": {"type": "cloud_service_status", "supported": True, "connected": True, "has_connected": True, "connection_issue": False, "last_connection_success": int(time.time()), "update_server_usa": False, "next_scheduled_update": int(time.time()) + 3600, "scheduled_updates_enabled": True, "server_address": "192.0.2.1:443", "fortigate_wan_ip": "198.51.100.1"},
+            "forticare": {"type": "cloud_service_status", "status": "registered", "registration_status": "registered", "registration_supported": True, "account": "ops@example.com", "support": {"hardware": {"status": "licensed", "support_level": "Advanced HW", "expires": expires}, "enhanced": {"status": "licensed", "support_level": "Premium", "expires": expires}}, "company": "Example", "industry": ""},
+            "antivirus": downloaded,
+            "ips": downloaded | {"entitlement": "NIDS"},
+            "appctrl": downloaded | {"entitlement": "FMWR"},
+            "web_filtering": {"type": "live_fortiguard_service", "status": "licensed", "expires": expires, "entitlement": "FURL", "category_list_version": 9, "running": True},
+            "vdom": {"type": "platform", "can_upgrade": False, "used": self.config.vdoms, "max": max(10, self.config.vdoms)},
+        }
+
+    def _ntp(self, vdom: str) -> object:
+        return [{"server": f"ntp{index}.example.com", "ip": f"192.0.2.{10 + index}", "reachable": True, "stratum": 2, "offset": 0.25, "selected": index == 0} for index in range(2)]
+
+    def _ipsec(self, vdom: str) -> object:
+        rng = random.Random(f"{self.config.seed}-ipsec-{vdom}")
+        tunnels = []
+        for tunnel in range(self.config.ipsec_tunnels):
+            proxyid = []
+            for selector in range(self.config.ipsec_selectors):
+                up = rng.random() > 0.05
+                proxyid.append(
+                    {
+                        "proxy_src": [{"subnet": _subnet_range(_network(selector)), "port": 0, "protocol": 0, "protocol_name": ""}],
+                        "proxy_dst": [{"subnet": _subnet_range(_network(4096 + tunnel * self.config.ipsec_selectors + selector)), "port": 0, "protocol": 0, "protocol_name": ""}],
+                        "status": "up" if up else "down",
+                        "p2name": f"P2_{tunnel:03d}_{selector:03d}",
+                        "p2serial": selector + 1,
+                        "expire": rng.randrange(60, 3600) if up else 0,
+                        "incoming_bytes": rng.randrange(10**9) if up else 0,
+                        "outgoing_bytes": rng.randrange(10**9) if up else 0,
+                    }
+                )
+            tunnels.append(
+                {
+                    "proxyid": proxyid,
+                    "name": f"P1_{vdom}_{tunnel:03d}",
+                    "comments": "",
+                    "wizard-type": "custom",
+                    "connection_count": rng.randrange(1000),
+                    "creation_time": rng.randrange(10**7),
+                    "type": "automatic",
+                    "incoming_bytes": sum(entry["incoming_bytes"] for entry in proxyid),
+                    "outgoing_bytes": sum(entry["outgoing_bytes"] for entry in proxyid),
+                    "rgwy": f"203.0.113.{tunnel % 254 + 1}",
+                    "tun_id": f"203.0.113.{tunnel % 254 + 1}",
+                }
+            )
+        return tunnels
+
+    def _uptime(self, vdom: str) -> object:
+        now = int(time.time() * 1000)
+        return {"snapshot_utc_time": now, "utc_last_reboot": now - 90 * 86400 * 1000, "time_zone_offset": 60, "hostname": "fgsynth"}
+
+    def _ha_history(self, vdom: str) -> object:
+        now = int(time.time())
+        return {"start_time": now - 90 * 86400, "last_change": now - 86400, "history": [{"time": now - 86400, "event": "member FGSYNTH000000002 lost heartbeat on hbdev port2"}]}
+
+    def _ha_peer(self, vdom: str) -> object:
+        return [{"hostname": f"fgsynth{index}", "priority": 200 - 20 * index, "serial_no": f"FGSYNTH00000000{index + 1}", "vcluster_id": 0} for index in range(2)]
+
+    def _interface_names(self, vdom: str) -> list[str]:
+        return [f"{vdom.lower()}_port{index + 1}" for index in range(self.config.interfaces)]
+
+    def _interfaces(self, vdom: str) -> object:
+        rng = random.Random(f"{self.config.seed}-interfaces-{vdom}")
+        vdom_index = self.vdom_names.index(vdom) if vdom in self.vdom_names else 0
+        interfaces = {}
+        for index, name in enumerate(self._interface_names(vdom)):
+            network = _network(vdom_index * 1024 + index)
+            interfaces[name] = {
+                "id": name,
+                "name": name,
+                "alias": "",
+                "mac": _mac(rng),
+                "ip": str(network.network_address + 1),
+                "mask": 24,
+                "link": rng.random() > 0.1,
+                "speed": 1000.0,
+                "duplex": 1,
+                "tx_packets": rng.randrange(10**9),
+                "rx_packets": rng.randrange(10**9),
+                "tx_bytes": rng.randrange(10**12),
+                "rx_bytes": rng.randrange(10**12),
+                "tx_errors": 0,
+                "rx_errors": rng.randrange(3),
+            }
+        return interfaces
+
+    def _interfaces_cmdb(self, vdom: str) -> object:
+        rng = random.Random(f"{self.config.seed}-interfaces-cmdb")
+        return [
+            {
+                "name": name,
+                "q_origin_key": name,
+                "vdom": vdom_name,
+                "alias": "",
+                "description": f"synthetic interface {name}",
+                "interface": "",
+                "macaddr": _mac(rng),
+                "mode": "static",
+                "type": "physical",
+                "status": "up",
+                "role": "lan",
+                "speed": "auto",
+                "mtu": 1500,
+                "tagging": [],
+                "vlanid": 0,
+            }
+            for vdom_name in self.vdom_names
+            for name in self._interface_names(vdom_name)
+        ]
+
+    def _vdom_resource(self, vdom: str) -> object:
+        rng = random.Random(f"{self.config.seed}-resources-{vdom}")
+        return {"cpu": rng.randrange(1, 40) if self.config.cpu is None else self.config.cpu, "memory": rng.randrange(20, 60), "session": {"current_usage": rng.randrange(10**5), "custom_max": 0, "global_max": 0, "guaranteed": 0, "usage_percent": 0}, "is_deletable": vdom != "root"}
+
+    def _bgp_neighbors(self, vdom: str) -> object:
+        return [{"admin_status": True, "local_ip": "198.51.100.1", "neighbor_ip": "198.51.100.2", "remote_as": 64512, "state": "Established", "type": "ipv4"}]
+
+    def _system_status(self, vdom: str) -> object:
+        return {"hostname": "fgsynth", "model_name": "FortiGate", "model_number": "200F", "model": "FGT200F"}
+
+    def _sslvpn(self, vdom: str) -> object:
+        return []
+
+    def _switch_status(self, vdom: str) -> object:
+        rng = random.Random(f"{self.config.seed}-switch-status")
+        return [
+            {
+                "name": switch["name"],
+                "serial": switch["serial"],
+                "connecting_from": f"10.255.{index // 250}.{index % 250 + 1}",
+                "fgt_peer_intf_name": "fortilink",
+                "is_l3": False,
+                "join_time": "Thu Mar  7 13:29:08 2024",
+                "max_poe_budget": 800,
+                "igmp_snooping_supported": True,
+                "dhcp_snooping_supported": True,
+                "mc_lag_supported": True,
+                "led_blink_supported": True,
+                "os_version": "S448EF-v7.2.4-build444,230317 (GA)",
+                "state": "Authorized",
+                "status": "Connected",
+                "type": "physical",
+                "vdom": "root",
+                "ports": [
+                    {
+                        "interface": f"port{port + 1}",
+                        "status": "up" if rng.random() > 0.3 else "down",
+                        "duplex": "full",
+                        "speed": 1000,
+                        "vlan": "LAN",
+                        "poe_capable": True,
+                        "poe_status": "enabled",
+                        "port_power": round(rng.random() * 15, 1),
+                        "power_status": 2,
+                        "fortilink_port": port == self.config.ports - 1,
+                        "fgt_peer_device_name": "",
+                        "fgt_peer_port_name": "",
+                        "isl_peer_device_name": "",
+                        "isl_peer_port_name": "",
+                        "isl_peer_trunk_name": "",
+                        "mclag": False,
+                        "mclag_icl": False,
+                        "igmp_snooping_group": {"group_count": 0},
+                        "dhcp_snooping": {"untrusted": 0},
+                    }
+                    for port in range(self.config.ports)
+                ],
+            }
+            for index, switch in enumerate(self._switches)
+        ]
+
+    def _switch_port_stats(self, vdom: str) -> object:
+        rng = random.Random(f"{self.config.seed}-port-stats")
+        counters = ("collisions", "crc-alignments", "fragments", "jabbers", "l3packets", "rx-bcast", "rx-bytes", "rx-drops", "rx-errors", "rx-mcast", "rx-oversize", "rx-packets", "rx-ucast", "tx-bcast", "tx-bytes", "tx-drops", "tx-errors", "tx-mcast", "tx-oversize", "tx-packets", "tx-ucast", "undersize")
+        return [
+            {
+                "serial": switch["serial"],
+                "ports": {f"port{port + 1}": {counter: rng.randrange(10**9) if counter.endswith(("bytes", "packets", "cast")) else 0 for counter in counters} for port in range(self.config.ports)},
+            }
+            for switch in self._switches
+        ]
+
+    def _switch_cmdb(self, vdom: str) -> object:
+        return [
+            {
+                "switch-id": switch["serial"],
+                "name": switch["serial"],
+                "q_origin_key": switch["serial"],
+                "type": "physical",
+                "version": 1,
+                "ports": [self._cmdb_port(switch, port) for port in range(self.config.ports)],
+            }
+            for switch in self._switches
+        ]
+
+    def _cmdb_port(self, switch: Mapping[str, object], port: int) -> Mapping[str, object]:
+        # the attributes PhysicalPort requires, with the values of a FortiSwitch 448E access port
+        return {
+            "port-name": f"port{port + 1}",
+            "q_origin_key": f"port{port + 1}",
+            "port-number": port + 1,
+            "switch-id": switch["serial"],
+            "mac-addr": f"{str(switch['mac_base'])[:-2]}{port:02x}",
+            "description": "",
+            "status": "up",
+            "type": "physical",
+            "mode": "static",
+            "speed": "auto",
+            "speed-mask": 207,
+            "vlan": "LAN",
+            "access-mode": "static",
+            "aggregator-mode": "bandwidth",
+            "allowed-vlans-all": "disable",
+            "arp-inspection-trust": "untrusted",
+            "bundle": "disable",
+            "discard-mode": "none",
+            "edge-port": "enable",
+            "export-to": "root",
+            "export-to-pool": "",
+            "export-to-pool-flag": 0,
+            "fec-capable": 0,
+            "fec-state": "cl91",
+            "fgt-peer-device-name": "",
+            "fgt-peer-port-name": "",
+            "fiber-port": 0,
+            "flags": 0,
+            "flow-control": "disable",
+            "fortilink-port": 0,
+            "ip-source-guard": "disable",
+            "isl-local-trunk-name": "",
+            "isl-peer-device-name": "",
+            "isl-peer-port-name": "",
+            "lacp-speed": "slow",
+            "learning-limit": 0,
+            "lldp-profile": "default-auto-isl",
+            "lldp-status": "tx-rx",
+            "loop-guard": "disabled",
+            "loop-guard-timeout": 45,
+            "matched-dpp-intf-tags": "",
+            "matched-dpp-policy": "",
+            "max-bundle": 24,
+            "mclag-icl-port": 0,
+            "p2p-port": 0,
+            "media-type": "RJ45",
+            "member-withdrawal-behavior": "block",
+            "min-bundle": 1,
+            "packet-sample-rate": 512,
+            "packet-sampler": "disabled",
+            "pause-meter": 0,
+            "pause-meter-resume": "50%",
+            "poe-capable": 1,
+            "poe-max-power": "30.0W",
+            "poe-pre-standard-detection": "disable",
+            "poe-standard": "802.3af/at",
+            "poe-status": "enable",
+            "port-owner": "",
+            "port-policy": "",
+            "port-prefix-type": 0,
+            "port-security-policy": "",
+            "port-selection-criteria": "src-dst-ip",
+            "ptp-policy": "default",
+            "qos-policy": "default",
+            "rpvst-port": "disabled",
+            "sample-direction": "both",
+            "sflow-counter-interval": 0,
+            "stacking-port": 0,
+            "sticky-mac": "disable",
+            "storm-control-policy": "default",
+            "stp-bpdu-guard": "disabled",
+            "stp-bpdu-guard-timeout": 5,
+            "stp-root-guard": "disabled",
+            "stp-state": "enabled",
+            "trunk-member": 0,
+            "virtual-port": 0,
+        }
+
+    def _switch_health(self, vdom: str) -> object:
+        rng = random.Random(f"{self.config.seed}-switch-health")
+        return {
+            switch["serial"]: {
+                "performance-status": {
+                    "cpu": {"idle": {"unit": "%", "value": rng.randrange(60, 99)}, "nice": {"unit": "%", "value": 0}, "system": {"unit": "%", "value": rng.randrange(10)}, "user": {"unit": "%", "value": rng.randrange(10)}},
+                    "memory": {"used": {"unit": "%", "value": rng.randrange(20, 60)}},
+                    "uptime": {"days": {"unit": "days", "value": rng.randrange(400)}, "hours": {"unit": "hours", "value": rng.randrange(24)}, "minutes": {"unit": "minutes", "value": rng.randrange(60)}},
+                },
+                "poe": {"max_value": 800, "unit": "watts", "value": round(rng.random() * 300, 1)},
+            }
+            for switch in self._switches
+        }
+
+    def _managed_aps(self, vdom: str) -> object:
+        rng = random.Random(f"{self.config.seed}-aps")
+        good = {"severity": "good", "value": 0}
+        return [
+            {
+                "name": f"AP{index:04d}",
+                "serial": f"FP231FTF{index:08d}",
+                "status": "connected",
+                "state": "authorized",
+                "connection_state": "Connected",
+                "clients": rng.randrange(50),
+                "local_ipv4_addr": f"10.254.{index // 250}.{index % 250 + 1}",
+                "board_mac": _mac(rng),
+                "os_version": "FP231F-v7.0-build0134",
+                "lldp_enable": True,
+                "ssid": [{"radio": 1, "list": ["corp"]}, {"radio": 2, "list": ["corp", "guest"]}],
+                "radio": [{"radio_id": radio, "mode": "AP", "client_count": rng.randrange(25), "bytes_rx": rng.randrange(10**10), "bytes_tx": rng.randrange(10**10), "channel_utilization_percent": rng.randrange(80)} for radio in (1, 2)],
+                "wired": [{"interface": "lan1", "bytes_rx": rng.randrange(10**10), "bytes_tx": rng.randrange(10**10), "packets_rx": rng.randrange(10**8), "packets_tx": rng.randrange(10**8), "errors_rx": 0, "errors_tx": 0, "dropped_rx": 0, "dropped_tx": 0, "collisions": 0, "link_speed_mbps": 1000, "is_carrier_link": True, "is_full_duplex": True, "max_link_speed": 1000}],
+                "health": {"general": {"country_code": good, "uplink_status": [{"severity": "good", "value": 1000}], "overall": good}},
+                "cpu_usage": rng.randrange(50),
+                "mem_free": 562836,
+                "mem_total": 903584,
+            }
+            for index in range(self.config.access_points)
+        ]
+
+    def _dhcp_scopes(self) -> list[ipaddress.IPv4Network]:
+        # a /24 scope per 200 leases, at least one
+        return [_network(8192 + index) for index in range(max(1, -(-self.config.dhcp_leases // 200)))]
+
+    def _dhcp_servers(self, vdom: str) -> object:
+        return [
+            {
+                "id": index + 1,
+                "q_origin_key": index + 1,
+                "status": "enable",
+                "lease-time": 604800,
+                "default-gateway": str(network.network_address + 1),
+                "netmask": str(network.netmask),
+                "interface": f"root_port{index + 1}",
+                "ip-range": [{"id": 1, "q_origin_key": 1, "start-ip": str(network.network_address + 20), "end-ip": str(network.network_address + 254), "vci-match": "disable", "vci-string": [], "uci-match": "disable", "uci-string": [], "lease-time": 0}],
+                "mac-acl-default-action": "assign",
+                "forticlient-on-net-status": "enable",
+                "dns-service": "default",
+                **{f"dns-server{number}": "0.0.0.0" for number in range(1, 5)},
+                "wifi-ac-service": "specify",
+                **{f"wifi-ac{number}": "0.0.0.0" for number in range(1, 4)},
+                "ntp-service": "local",
+                **{f"ntp-server{number}": "0.0.0.0" for number in range(1, 4)},
+                "domain": "",
+                "wins-server1": "0.0.0.0",
+                "wins-server2": "0.0.0.0",
+                "next-server": "0.0.0.0",
+                "timezone-option": "disable",
+                "timezone": "00",
+                "tftp-server": [],
+                "filename": "",
+                "options": [],
+                "server-type": "regular",
+                "ip-mode": "range",
+                "conflicted-ip-timeout": 1800,
+                "ipsec-lease-hold": 60,
+                "auto-configuration": "enable",
+                "dhcp-settings-from-fortiipam": "disable",
+                "auto-managed-status": "enable",
+                "ddns-update": "disable",
+                "ddns-update-override": "disable",
+                "ddns-server-ip": "0.0.0.0",
+                "ddns-zone": "",
+                "ddns-auth": "disable",
+                "ddns-keyname": "",
+                "ddns-key": "",
+                "ddns-ttl": 300,
+                "vci-match": "disable",
+                "vci-string": [],
+                "exclude-range": [],
+                "reserved-address": [],
+            }
+            for index, network in enumerate(self._dhcp_scopes())
+        ]
+
+    def _dhcp_leases(self, vdom: str) -> object:
+        rng = random.Random(f"{self.config.seed}-dhcp")
+        scopes = self._dhcp_scopes()
+        expire = int(time.time()) + 86400
+        leases = []
+        for index in range(self.config.dhcp_leases):
+            scope, offset = divmod(index, 200)
+            network = scopes[scope]
+            leases.append(
+                {
+                    "ip": str(network.network_address + 20 + offset),
+                    "reserved": rng.random() < 0.05,
+                    "mac": _mac(rng),
+                    "hostname": f"client{index:06d}",
+                    "expire_time": expire + rng.randrange(86400),
+                    "status": "leased" if rng.random() > 0.01 else "conflict",
+                    "interface": f"root_port{scope + 1}",
+                    "type": "ipv4",
+                    "server_mkey": scope + 1,
+                    "server_ipam_enabled": False,
+                }
+            )
+        return leases
+
+    def _sensors(self, vdom: str) -> object:
+        return [{"id": "temperature.cpu", "name": "CPU", "type": "temperature", "value": 48.0, "alarm": False, "thresholds": {"upper_non_critical": 85.0, "upper_critical": 95.0}}]
+
+
+class FortiOSRequestHandler(BaseHTTPRequestHandler):
+    """
+    Serves GET /api/v2/<path> with keep-alive, gzip/deflate and the injected latency and errors.
+    """
+
+    protocol_version = "HTTP/1.1"
+    server: FortiOSMockServer
+
+    def log_message(self, format: str, *args) -> None:
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+    def do_GET(self) -> None:
+        url = urlsplit(self.path)
+        params = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        path = url.path.removeprefix("/api/v2/")
+
+        self.server.count_request(path)
+        if latency := self.server.latency:
+            time.sleep(max(0.0, self.server.rng.gauss(latency, latency * self.server.jitter)))
+
+        if not self.headers.get("Authorization", "").startswith("Bearer "):
+            self._send_json(401, {"http_status": 401, "status": "error"})
+            return
+        if path in self.server.hanging:
+            # like an overloaded management plane, the client runs into its timeout
+            time.sleep(3600)
+            return
+        if path in self.server.missing:
+            self._send_json(404, {"http_status": 404, "status": "error"})
+            return
+        if self.server.rng.random() < self.server.error_rate:
+            if self.server.rng.random() < 0.5:
+                # a dropped connection, as seen behind overloaded WAN links
+                self.close_connection = True
+                self.connection.shutdown(2)
+                return
+            self._send_json(500, {"http_status": 500, "status": "error"})
+            return
+
+        status, body = self.server.fortigate.response(path, params)
+        self._send_json(status, body)
+
+    def _send_json(self, status: int, body: object) -> None:
+        content = json.dumps(body, separators=(",", ":")).encode()
+        encoding = "identity"
+        accepted = self.headers.get("Accept-Encoding", "")
+        if self.server.compression and "gzip" in accepted:
+            content, encoding = gzip.compress(content, compresslevel=6), "gzip"
+        elif self.server.compression and "deflate" in accepted:
+            content, encoding = zlib.compress(content), "deflate"
+
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(content)))
+        if encoding != "identity":
+            self.send_header("Content-Encoding", encoding)
+        self.end_headers()
+        self.wfile.write(content)
+
+
+class FortiOSMockServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address: tuple[str, int], fortigate: SyntheticFortiGate, latency: float = 0.0, jitter: float = 0.2, error_rate: float = 0.0, missing: Sequence[str] = (), hanging: Sequence[str] = (), compression: bool = True, verbose: bool = False) -> None:
+        super().__init__(address, FortiOSRequestHandler)
+        self.fortigate = fortigate
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.missing = set(missing)
+        self.hanging = set(hanging)
+        self.compression = compression
+        self.verbose = verbose
+        self.rng = random.Random(fortigate.config.seed)
+        self.requests: dict[str, int] = {}
+        self._requests_lock = threading.Lock()
+
+    def count_request(self, path: str) -> None:
+        with self._requests_lock:
+            self.requests[path] = self.requests.get(path, 0) + 1
+
+
+def _self_signed_certificate(directory: Path) -> tuple[Path, Path]:
+    cert_file, key_file = directory / "cert.pem", directory / "key.pem"
+    subprocess.run(
+        ["openssl", "req", "-x509", "-newkey", "rsa:2048", "-nodes", "-days", "2", "-subj", "/CN=localhost", "-keyout", str(key_file), "-out", str(cert_file)],
+        check=True,
+        capture_output=True,
+    )
+    return cert_file, key_file
+
+
+def parse_arguments(argv: Sequence[str] | None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--address", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8443)
+    parser.add_argument("--cert-file", type=Path, help="PEM certificate, a self-signed one is created if missing")
+    parser.add_argument("--key-file", type=Path)
+    parser.add_argument("--vdoms", type=int, default=FleetConfig.vdoms)
+    parser.add_argument("--interfaces", type=int, default=FleetConfig.interfaces, help="interfaces per VDOM")
+    parser.add_argument("--ipsec-tunnels", type=int, default=FleetConfig.ipsec_tunnels, help="phase-1 tunnels per VDOM")
+    parser.add_argument("--ipsec-selectors", type=int, default=FleetConfig.ipsec_selectors, help="phase-2 selectors per tunnel")
+    parser.add_argument("--switches", type=int, default=FleetConfig.switches)
+    parser.add_argument("--ports", type=int, default=FleetConfig.ports, help="ports per switch")
+    parser.add_argument("--access-points", type=int, default=FleetConfig.access_points)
+    parser.add_argument("--dhcp-leases", type=int, default=FleetConfig.dhcp_leases)
+    parser.add_argument("--cpu", type=int, default=FleetConfig.cpu, help="CPU load per VDOM in percent")
+    parser.add_argument("--seed", type=int, default=FleetConfig.seed)
+    parser.add_argument("--latency", type=float, default=0.0, help="mean response latency in seconds")
+    parser.add_argument("--jitter", type=float, default=0.2, help="standard deviation of the latency, relative to it")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="share of requests answered with HTTP 500 or a dropped connection")
+    parser.add_argument("--missing", action="append", default=[], help="answer this path with HTTP 404, e.g. monitor/router/bgp/neighbors")
+    parser.add_argument("--hang", action="append", default=[], help="never answer requests on this path")
+    parser.add_argument("--no-compression", action="store_true")
+    parser.add_argument("--verbose", "-v", action="store_true")
+    return parser.parse_args(argv)
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    args = parse_arguments(argv)
+    config = FleetConfig(
+        vdoms=args.vdoms,
+        interfaces=args.interfaces,
+        ipsec_tunnels=args.ipsec_tunnels,
+        ipsec_selectors=args.ipsec_selectors,
+        switches=args.switches,
+        ports=args.ports,
+        access_points=args.access_points,
+        dhcp_leases=args.dhcp_leases,
+        cpu=args.cpu,
+        seed=args.seed,
+    )
+    server = FortiOSMockServer(
+        (args.address, args.port),
+        SyntheticFortiGate(config),
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        missing=args.missing,
+        hanging=args.hang,
+        compression=not args.no_compression,
+        verbose=args.verbose,
+    )
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        cert_file, key_file = (args.cert_file, args.key_file or args.cert_file) if args.cert_file else _self_signed_certificate(Path(temp_dir))
+        context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+        context.load_cert_chain(cert_file, key_file)
+        server.socket = context.wrap_socket(server.socket, server_side=True)
+
+        # print the request counts on kill as well
+        signal.signal(signal.SIGTERM, signal.default_int_handler)
+        sys.stderr.write(f"Serving {len(server.fortigate.paths)} endpoints on https://{args.address}:{args.port}/api/v2/\n")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
+            for path, count in sorted(server.requests.items()):
+                sys.stderr.write(f"{count:6d} {path}\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
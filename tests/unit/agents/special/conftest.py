@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+# -*- encoding: utf-8; py-indent-offset: 4 -*-
+
+# This is free software;  you can redistribute it and/or modify it
+# under the  terms of the  GNU General Public License  as published by
+# the Free Software Foundation in version 2.  check_mk is  distributed
+# in the hope that it will be useful, but WITHOUT ANY WARRANTY;  with-
+# out even the implied warranty of  MERCHANTABILITY  or  FITNESS FOR A
+# PARTICULAR PURPOSE. See the  GNU General Public License for more de-
+# tails. You should have  received  a copy of the  GNU  General Public
+# License along with GNU Make; see the file  COPYING.  If  not,  write
+# to the Free Software Foundation, Inc., 51 Franklin St,  Fifth Floor,
+# Boston, MA 02110-1301 USA.
+
+# WAGNER AG
+# Developer: opensource@wagner.ch
+
+import importlib.util
+import ssl
+import sys
+import threading
+from importlib.machinery import SourceFileLoader
+from pathlib import Path
+from types import ModuleType
+from typing import Iterator
+
+import pytest
+
+_REPOSITORY = Path(__file__).resolve().parents[4]
+
+
+def _load_module(name: str, path: Path) -> ModuleType:
+    # the special agent has no .py extension, it is loaded like the plugins load it
+    loader = SourceFileLoader(name, str(path))
+    spec = importlib.util.spec_from_loader(name, loader)
+    module = importlib.util.module_from_spec(spec)
+    # dataclasses look up their module while the class is created
+    sys.modules[name] = module
+    loader.exec_module(module)
+    return module
+
+
+agent_fortios = _load_module("agent_fortios", _REPOSITORY / "agents" / "special" / "agent_fortios")
+fortios_rest_server = _load_module("fortios_rest_server", _REPOSITORY / "tests" / "mock" / "fortios_rest_server.py")
+
+
+@pytest.fixture(name="agent", scope="session")
+def fixture_agent() -> ModuleType:
+    return agent_fortios
+
+
+@pytest.fixture(name="mock", scope="session")
+def fixture_mock() -> ModuleType:
+    return fortios_rest_server
+
+
+@pytest.fixture(name="certificate", scope="session")
+def fixture_certificate(tmp_path_factory: pytest.TempPathFactory) -> tuple[Path, Path]:
+    return fortios_rest_server._self_signed_certificate(tmp_path_factory.mktemp("certificate"))
+
+
+@pytest.fixture(name="mock_server")
+def fixture_mock_server(certificate: tuple[Path, Path]) -> Iterator:
+    """A small synthetic FortiGate on a free local port, see tests/mock/fortios_rest_server.py"""
+    config = fortios_rest_server.FleetConfig(vdoms=1, interfaces=10, switches=2, ports=4, access_points=5, dhcp_leases=20)
+    server = fortios_rest_server.FortiOSMockServer(("127.0.0.1", 0), fortios_rest_server.SyntheticFortiGate(config))
+    context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+    context.load_cert_chain(*certificate)
+    server.socket = context.wrap_socket(server.socket, server_side=True)
+    thread = threading.Thread(target=server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True)
+    thread.start()
+    try:
+        yield server
+    finally:
+        server.shutdown()
+        server.server_close()
+        thread.join()
@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+# -*- encoding: utf-8; py-indent-offset: 4 -*-
+
+# This is free software;  you can redistribute it and/or modify it
+# under the  terms of the  GNU General Public License  as published by
+# the Free Software Foundation in version 2.  check_mk is  distributed
+# in the hope that it will be useful, but WITHOUT ANY WARRANTY;  with-
+# out even the implied warranty of  MERCHANTABILITY  or  FITNESS FOR A
+# PARTICULAR PURPOSE. See the  GNU General Public License for more de-
+# tails. You should have  received  a copy of the  GNU  General Public
+# License along with GNU Make; see the file  COPYING.  If  not,  write
+# to the Free Software Foundation, Inc., 51 Franklin St,  Fifth Floor,
+# Boston, MA 02110-1301 USA.
+
+# WAGNER AG
+# Developer: opensource@wagner.ch
+
+import asyncio
+
+
+def _data(result):
+    return result.data.materialize() if hasattr(result.data, "materialize") else result.data
+
+
+def test_backends_collect_the_same_data(agent, mock_server) -> None:
+    specs = list(agent._SECTIONS)
+    threaded = [_data(result) for result in agent.FortiOS("127.0.0.1", mock_server.server_port, "token", False, 5, workers=4, page_size=3).collect_sections(specs)]
+    awaited = [_data(result) for result in agent.AsyncFortiOS("127.0.0.1", mock_server.server_port, "token", False, 5, workers=4, page_size=3).collect_sections(specs)]
+    assert threaded == awaited
+
+
+def test_async_session_replaces_closed_idle_connection(agent, mock_server) -> None:
+    session = agent._AsyncFortiOSSession("127.0.0.1", mock_server.server_port, False, 5)
+    headers = {"Authorization": "Bearer token"}
+
+    async def collect():
+        session.open()
+        try:
+            first = await session.get("v2/monitor/system/status", headers)
+            # like a FortiGate that closed the idle keep-alive connection in the meantime
+            _reader, writer = session._idle[0]
+            writer.close()
+            await writer.wait_closed()
+            return first, await session.get("v2/monitor/system/status", headers)
+        finally:
+            await session.close()
+
+    first, second = asyncio.run(collect())
+    assert first.status_code == second.status_code == 200
+    assert mock_server.requests["monitor/system/status"] == 2
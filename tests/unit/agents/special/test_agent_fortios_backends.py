@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+# -*- encoding: utf-8; py-indent-offset: 4 -*-
+
+# This is free software;  you can redistribute it and/or modify it
+# under the  terms of the  GNU General Public License  as published by
+# the Free Software Foundation in version 2.  check_mk is  distributed
+# in the hope that it will be useful, but WITHOUT ANY WARRANTY;  with-
+# out even the implied warranty of  MERCHANTABILITY  or  FITNESS FOR A
+# PARTICULAR PURPOSE. See the  GNU General Public License for more de-
+# tails. You should have  received  a copy of the  GNU  General Public
+# License along with GNU Make; see the file  COPYING.  If  not,  write
+# to the Free Software Foundation, Inc., 51 Franklin St,  Fifth Floor,
+# Boston, MA 02110-1301 USA.
+
+# WAGNER AG
+# Developer: opensource@wagner.ch
+
+import logging
+
+import pytest
+
+
+@pytest.fixture(name="fortios", params=["threads", "asyncio"])
+def fixture_fortios(request, agent, mock_server):
+    fortios_class = agent.AsyncFortiOS if request.param == "asyncio" else agent.FortiOS
+    return fortios_class("127.0.0.1", mock_server.server_port, "token", False, 5, workers=4)
+
+
+def test_collect_sections_twice(agent, fortios) -> None:
+    # the daemon collects every interval with the same instance, asyncio on a new event loop each time
+    specs = list(agent._SECTIONS)
+    for _run in range(2):
+        results = list(fortios.collect_sections(specs))
+        assert [result.spec for result in results] == specs
+        assert all(result.data is not None for result in results)
+
+
+def test_connection_pool_keeps_streamed_connections(agent, mock_server, caplog) -> None:
+    fortios = agent.FortiOS("127.0.0.1", mock_server.server_port, "token", False, 5, workers=2)
+    with caplog.at_level(logging.WARNING, logger="urllib3.connectionpool"):
+        for result in fortios.collect_sections(list(agent._SECTIONS)):
+            if isinstance(result.data, agent._StreamedPayload):
+                # written by the main thread while the workers go on with the next requests
+                result.data.materialize()
+
+    assert not [record for record in caplog.records if "pool is full" in record.getMessage()]
+
+
+def test_streamed_section_with_error_status(agent, fortios, mock_server, monkeypatch) -> None:
+    response = mock_server.fortigate.response
+
+    def error_response(path, params):
+        if path == "monitor/system/dhcp":
+            return 200, {"http_status": 500, "status": "error"}
+        return response(path, params)
+
+    monkeypatch.setattr(mock_server.fortigate, "response", error_response)
+    (result,) = fortios.collect_sections([spec for spec in agent._SECTIONS if spec.name == "dhcp_lease"])
+
+    assert result.data is None
+    assert result.stats.status_code == 200
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+# -*- encoding: utf-8; py-indent-offset: 4 -*-
+
+# This is free software;  you can redistribute it and/or modify it
+# under the  terms of the  GNU General Public License  as published by
+# the Free Software Foundation in version 2.  check_mk is  distributed
+# in the hope that it will be useful, but WITHOUT ANY WARRANTY;  with-
+# out even the implied warranty of  MERCHANTABILITY  or  FITNESS FOR A
+# PARTICULAR PURPOSE. See the  GNU General Public License for more de-
+# tails. You should have  received  a copy of the  GNU  General Public
+# License along with GNU Make; see the file  COPYING.  If  not,  write
+# to the Free Software Foundation, Inc., 51 Franklin St,  Fifth Floor,
+# Boston, MA 02110-1301 USA.
+
+# WAGNER AG
+# Developer: opensource@wagner.ch
+
+import json
+import re
+
+SECTIONS = "device_info,managed_switch"
+
+
+def _batch_args(agent, mock_server, tmp_path, *argv: str):
+    targets_file = tmp_path / "targets.json"
+    targets_file.write_text(
+        json.dumps(
+            [
+                {"server": "127.0.0.1", "api_token": "token", "host_name": "fw1"},
+                {"server": "127.0.0.1", "api_token": "token", "host_name": "fw2"},
+            ]
+        )
+    )
+    return agent.parse_arguments(["--targets", str(targets_file), "--port", str(mock_server.server_port), "--no-cert-check", "--no-cache", "--sections", SECTIONS, *argv])
+
+
+def _piggyback_sections(output: str) -> list[tuple[str | None, str]]:
+    # the piggyback host of every section header, None outside of a piggyback block
+    host = None
+    sections = []
+    for line in output.splitlines():
+        if match := re.fullmatch(r"<<<<(.*)>>>>", line):
+            host = match.group(1) or None
+        elif match := re.fullmatch(r"<<<([^<>:]+).*>>>", line):
+            sections.append((host, match.group(1)))
+    return sections
+
+
+def test_batch_piggyback_output(agent, mock_server, tmp_path, capsys) -> None:
+    assert agent.agent_fortios(_batch_args(agent, mock_server, tmp_path)) == 0
+    output = capsys.readouterr().out
+    sections = _piggyback_sections(output)
+
+    # every section belongs to a FortiGate or to one of its switches, also the ones behind the switches
+    assert all(host is not None for host, _section in sections)
+    for host_name in ("fw1", "fw2"):
+        assert (host_name, "fortios_device_info") in sections
+        assert (host_name, "fortios_agent_stats") in sections
+    switches = [switch["name"] for switch in mock_server.fortigate.results("monitor/switch-controller/managed-switch/status", "root")]
+    assert sorted(host for host, section in sections if section == "fortios_managed_switch_interface") == sorted(switches * 2)
+    assert output.endswith("<<<<>>>>\n")
+
+
+def test_batch_output_dir(agent, mock_server, tmp_path, capsys) -> None:
+    output_dir = tmp_path / "output"
+    assert agent.agent_fortios(_batch_args(agent, mock_server, tmp_path, "--output-dir", str(output_dir))) == 0
+
+    assert capsys.readouterr().out == ""
+    assert sorted(path.name for path in output_dir.iterdir()) == ["fw1", "fw2"]
+    # no piggyback block of the FortiGate itself, the file is the output of its own agent run
+    assert (None, "fortios_device_info") in _piggyback_sections((output_dir / "fw1").read_text())
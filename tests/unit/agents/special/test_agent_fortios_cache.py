@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+# -*- encoding: utf-8; py-indent-offset: 4 -*-
+
+# This is free software;  you can redistribute it and/or modify it
+# under the  terms of the  GNU General Public License  as published by
+# the Free Software Foundation in version 2.  check_mk is  distributed
+# in the hope that it will be useful, but WITHOUT ANY WARRANTY;  with-
+# out even the implied warranty of  MERCHANTABILITY  or  FITNESS FOR A
+# PARTICULAR PURPOSE. See the  GNU General Public License for more de-
+# tails. You should have  received  a copy of the  GNU  General Public
+# License along with GNU Make; see the file  COPYING.  If  not,  write
+# to the Free Software Foundation, Inc., 51 Franklin St,  Fifth Floor,
+# Boston, MA 02110-1301 USA.
+
+# WAGNER AG
+# Developer: opensource@wagner.ch
+
+import json
+import time
+
+import pytest
+
+
+def _spec(agent, name: str):
+    return next(spec for spec in agent._SECTIONS if spec.name == name)
+
+
+def _fortios(agent, mock_server, backend: str = "threads", timeout: int = 5, **kwargs):
+    fortios_class = agent.AsyncFortiOS if backend == "asyncio" else agent.FortiOS
+    return fortios_class("127.0.0.1", mock_server.server_port, "token", False, timeout, **kwargs)
+
+
+def _collect(fortios, spec):
+    [result] = fortios.collect_sections([spec])
+    return result
+
+
+def _store_expired(cache, spec, data) -> None:
+    cache.store(spec, data)
+    cache._file(spec).write_text(json.dumps({"timestamp": time.time() - spec.cache_ttl - 1, "data": data}))
+
+
+def test_section_cache(agent, tmp_path) -> None:
+    cache = agent._SectionCache(tmp_path)
+    spec = _spec(agent, "dhcp_scope")
+
+    assert cache.load(spec) is None
+    cache.store(spec, {"results": [{"id": 1}]})
+    assert cache.load(spec).data == {"results": [{"id": 1}]}
+    assert cache.load(spec).age < 5
+    assert [path.name for path in tmp_path.iterdir()] == ["cmdb_system.dhcp_server.json"]
+
+    cache._file(spec).write_text('{"timestamp": 1')
+    assert cache.load(spec) is None
+
+
+@pytest.mark.parametrize("backend", ["threads", "asyncio"])
+def test_cached_section_within_ttl(agent, mock_server, tmp_path, backend: str) -> None:
+    fortios = _fortios(agent, mock_server, backend, cache=agent._SectionCache(tmp_path))
+    spec = _spec(agent, "device_info")
+
+    live = _collect(fortios, spec)
+    cached = _collect(fortios, spec)
+
+    assert live.cached_at is None
+    assert cached.cached_at is not None
+    assert cached.data == live.data
+    assert cached.section_name == f"fortios_device_info:cached({int(cached.cached_at)},{spec.cache_ttl})"
+    assert mock_server.requests["monitor/system/status"] == 1
+
+
+@pytest.mark.parametrize("backend", ["threads", "asyncio"])
+def test_expired_section_is_collected(agent, mock_server, tmp_path, backend: str) -> None:
+    cache = agent._SectionCache(tmp_path)
+    spec = _spec(agent, "device_info")
+    _store_expired(cache, spec, {"status": "success", "results": {"hostname": "old"}})
+
+    result = _collect(_fortios(agent, mock_server, backend, cache=cache), spec)
+
+    assert not result.from_cache
+    assert result.data["results"]["hostname"] == "fgsynth"
+    assert cache.load(spec).data == result.data
+
+
+def test_failed_section_served_from_cache(agent, mock_server, tmp_path) -> None:
+    cache = agent._SectionCache(tmp_path)
+    spec = _spec(agent, "device_info")
+    _store_expired(cache, spec, {"status": "success", "results": {"hostname": "old"}})
+    mock_server.missing.add("monitor/system/status")
+
+    result = _collect(_fortios(agent, mock_server, cache=cache), spec)
+
+    assert result.cached_at is not None
+    assert result.data["results"]["hostname"] == "old"
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+# -*- encoding: utf-8; py-indent-offset: 4 -*-
+
+# This is free software;  you can redistribute it and/or modify it
+# under the  terms of the  GNU General Public License  as published by
+# the Free Software Foundation in version 2.  check_mk is  distributed
+# in the hope that it will be useful, but WITHOUT ANY WARRANTY;  with-
+# out even the implied warranty of  MERCHANTABILITY  or  FITNESS FOR A
+# PARTICULAR PURPOSE. See the  GNU General Public License for more de-
+# tails. You should have  received  a copy of the  GNU  General Public
+# License along with GNU Make; see the file  COPYING.  If  not,  write
+# to the Free Software Foundation, Inc., 51 Franklin St,  Fifth Floor,
+# Boston, MA 02110-1301 USA.
+
+# WAGNER AG
+# Developer: opensource@wagner.ch
+
+import json
+
+import pytest
+
+
+def _spec(agent, name: str):
+    return next(spec for spec in agent._SECTIONS if spec.name == name)
+
+
+def _fortios(agent, mock_server, backend: str = "threads", timeout: int = 5, **kwargs):
+    fortios_class = agent.AsyncFortiOS if backend == "asyncio" else agent.FortiOS
+    return fortios_class("127.0.0.1", mock_server.server_port, "token", False, timeout, **kwargs)
+
+
+@pytest.mark.parametrize("backend", ["threads", "asyncio"])
+def test_capabilities_skip_unsupported_endpoints(agent, mock_server, tmp_path, backend: str) -> None:
+    mock_server.missing.add("monitor/router/bgp/neighbors")
+    specs = [_spec(agent, "device_info"), _spec(agent, "bgp_peer")]
+
+    fortios = _fortios(agent, mock_server, backend, capabilities=agent._Capabilities(tmp_path / "capabilities.json", 3600))
+    assert [result.unsupported for result in fortios.collect_sections(specs)] == [False, False]
+    assert [result.unsupported for result in fortios.collect_sections(specs)] == [False, True]
+    assert mock_server.requests["monitor/router/bgp/neighbors"] == 1
+
+    stored = json.loads((tmp_path / "capabilities.json").read_text())
+    assert stored["identity"] == {"serial": mock_server.fortigate.serial, "version": "v7.2.8", "build": 1639}
+    assert stored["unsupported"] == ["monitor/router/bgp/neighbors"]
+
+    # once the list is older than the reprobe interval, all endpoints are requested again
+    fortios = _fortios(agent, mock_server, backend, capabilities=agent._Capabilities(tmp_path / "capabilities.json", -1))
+    assert [result.unsupported for result in fortios.collect_sections(specs)] == [False, False]
+    assert mock_server.requests["monitor/router/bgp/neighbors"] == 2
+
+
+def test_capabilities_replaced_for_new_firmware(agent, tmp_path) -> None:
+    spec = _spec(agent, "bgp_peer")
+    capabilities = agent._Capabilities(tmp_path / "capabilities.json", 3600)
+    capabilities.start_run()
+    capabilities.observe({"serial": "FG1", "version": "v7.2.8", "build": 1639})
+    capabilities.add_unsupported(spec)
+    capabilities.save()
+
+    capabilities.start_run()
+    assert capabilities.is_unsupported(spec)
+    capabilities.observe([{"serial": "FG1", "version": "v7.4.3", "build": 2573}])
+    capabilities.save()
+
+    capabilities.start_run()
+    assert not capabilities.is_unsupported(spec)
+
+
+@pytest.mark.parametrize("unsupported", [False, True])
+def test_capabilities_written_on_change(agent, tmp_path, unsupported: bool) -> None:
+    spec = _spec(agent, "bgp_peer")
+    identity = {"serial": "FG1", "version": "v7.2.8", "build": 1639}
+    capabilities_file = tmp_path / "capabilities.json"
+
+    def run(capabilities) -> None:
+        capabilities.start_run()
+        capabilities.observe(identity)
+        if unsupported and not capabilities.is_unsupported(spec):
+            capabilities.add_unsupported(spec)
+        capabilities.save()
+
+    run(agent._Capabilities(capabilities_file, 3600))
+    written = capabilities_file.read_text()
+    mtime = capabilities_file.stat().st_mtime_ns
+
+    # the same FortiGate and the same endpoints, the file is left alone
+    run(agent._Capabilities(capabilities_file, 3600))
+    assert capabilities_file.stat().st_mtime_ns == mtime
+    assert capabilities_file.read_text() == written
+
+    # a reprobe stores the time of the probe
+    run(agent._Capabilities(capabilities_file, -1))
+    assert json.loads(capabilities_file.read_text())["probed_at"] > json.loads(written)["probed_at"]
+
+
+def test_capabilities_without_answer(agent, tmp_path) -> None:
+    capabilities = agent._Capabilities(tmp_path / "capabilities.json", 3600)
+    capabilities.start_run()
+    capabilities.add_unsupported(_spec(agent, "bgp_peer"))
+    capabilities.save()
+    assert not (tmp_path / "capabilities.json").exists()
@@ -0,0 +1,31 @@
+#!/usr/bin/env python3
+# -*- encoding: utf-8; py-indent-offset: 4 -*-
+
+# This is free software;  you can redistribute it and/or modify it
+# under the  terms of the  GNU General Public License  as published by
+# the Free Software Foundation in version 2.  check_mk is  distributed
+# in the hope that it will be useful, but WITHOUT ANY WARRANTY;  with-
+# out even the implied warranty of  MERCHANTABILITY  or  FITNESS FOR A
+# PARTICULAR PURPOSE. See the  GNU General Public License for more de-
+# tails. You should have  received  a copy of the  GNU  General Public
+# License along with GNU Make; see the file  COPYING.  If  not,  write
+# to the Free Software Foundation, Inc., 51 Franklin St,  Fifth Floor,
+# Boston, MA 02110-1301 USA.
+
+# WAGNER AG
+# Developer: opensource@wagner.ch
+
+import pytest
+
+
+@pytest.fixture(name="fortios", params=["threads", "asyncio"])
+def fixture_fortios(request, agent, mock_server):
+    fortios_class = agent.AsyncFortiOS if request.param == "asyncio" else agent.FortiOS
+    return fortios_class("127.0.0.1", mock_server.server_port, "token", False, 5, workers=4)
+
+
+def test_request_stats(agent, fortios, mock_server) -> None:
+    [result] = fortios.collect_sections([next(spec for spec in agent._SECTIONS if spec.name == "interfaces")])
+    assert result.stats.status_code == 200
+    assert result.stats.content_encoding == "gzip"
+    assert 0 < result.stats.wire_bytes < result.stats.body_bytes
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+# -*- encoding: utf-8; py-indent-offset: 4 -*-
+
+# This is free software;  you can redistribute it and/or modify it
+# under the  terms of the  GNU General Public License  as published by
+# the Free Software Foundation in version 2.  check_mk is  distributed
+# in the hope that it will be useful, but WITHOUT ANY WARRANTY;  with-
+# out even the implied warranty of  MERCHANTABILITY  or  FITNESS FOR A
+# PARTICULAR PURPOSE. See the  GNU General Public License for more de-
+# tails. You should have  received  a copy of the  GNU  General Public
+# License along with GNU Make; see the file  COPYING.  If  not,  write
+# to the Free Software Foundation, Inc., 51 Franklin St,  Fifth Floor,
+# Boston, MA 02110-1301 USA.
+
+# WAGNER AG
+# Developer: opensource@wagner.ch
+
+import json
+import os
+import signal
+import threading
+import time
+
+import pytest
+
+
+def _targets_args(agent, tmp_path, targets):
+    targets_file = tmp_path / "targets.json"
+    targets_file.write_text(json.dumps(targets))
+    return agent.parse_arguments(["--targets", str(targets_file), "--daemon", "--spool-dir", str(tmp_path / "spool")])
+
+
+def test_load_targets_interval(agent, tmp_path) -> None:
+    args = _targets_args(agent, tmp_path, [{"server": "fw1", "api_token": "token"}, {"server": "fw2", "api_token": "token", "interval": 300}])
+    assert [target.interval for target in agent._load_targets(args)] == [60, 300]
+
+
+@pytest.mark.parametrize("interval", [0, -60, "60", 1.5, True])
+def test_load_targets_rejects_interval(agent, tmp_path, interval) -> None:
+    args = _targets_args(agent, tmp_path, [{"server": "fw1", "api_token": "token", "interval": interval}])
+    with pytest.raises(agent.SpecialAgentError, match="Invalid interval for fw1"):
+        agent._load_targets(args)
+
+
+def test_interval_argument(agent, tmp_path) -> None:
+    with pytest.raises(SystemExit):
+        agent.parse_arguments(["--daemon", "--interval", "0", "--spool-dir", str(tmp_path), "--api-token", "token", "fw1"])
+
+
+def _host_args(agent, mock_server, spool_dir, *argv: str):
+    return agent.parse_arguments(["--spool-dir", str(spool_dir), "--port", str(mock_server.server_port), "--no-cert-check", "--no-cache", "--api-token", "token", "--sections", "device_info", *argv, "127.0.0.1"])
+
+
+def test_daemon_writes_spool_file(agent, mock_server, tmp_path) -> None:
+    spool_file = agent._spool_file(tmp_path, "127.0.0.1")
+    handlers = {signum: signal.getsignal(signum) for signum in (signal.SIGTERM, signal.SIGINT)}
+
+    def stop_when_spooled() -> None:
+        deadline = time.monotonic() + 10
+        while not spool_file.exists() and time.monotonic() < deadline:
+            time.sleep(0.05)
+        os.kill(os.getpid(), signal.SIGTERM)
+
+    stopper = threading.Thread(target=stop_when_spooled)
+    stopper.start()
+    try:
+        assert agent.agent_fortios(_host_args(agent, mock_server, tmp_path, "--daemon", "--interval", "60")) == 0
+    finally:
+        stopper.join()
+        for signum, handler in handlers.items():
+            signal.signal(signum, handler)
+
+    assert "<<<fortios_device_info" in spool_file.read_text()
+    assert mock_server.requests["monitor/system/status"] == 1
+
+
+def test_spooled_output(agent, mock_server, tmp_path, capsys) -> None:
+    spool_file = agent._spool_file(tmp_path, "127.0.0.1")
+    spool_file.write_text("<<<fortios_device_info:sep(0)>>>\n{}\n")
+
+    assert agent.agent_fortios(_host_args(agent, mock_server, tmp_path)) == 0
+    assert capsys.readouterr().out == spool_file.read_text()
+    assert "monitor/system/status" not in mock_server.requests
+
+
+@pytest.mark.parametrize("spooled", [False, True])
+def test_spooled_output_expired(agent, mock_server, tmp_path, capsys, spooled: bool) -> None:
+    # a missing spool file or one older than --spool-max-age, the data is collected directly
+    spool_file = agent._spool_file(tmp_path, "127.0.0.1")
+    if spooled:
+        spool_file.write_text("<<<fortios_device_info:sep(0)>>>\n{}\n")
+        os.utime(spool_file, (time.time() - 301, time.time() - 301))
+
+    assert agent.agent_fortios(_host_args(agent, mock_server, tmp_path, "--spool-max-age", "300")) == 0
+    assert '"serial"' in capsys.readouterr().out
+    assert mock_server.requests["monitor/system/status"] == 1
@@ -0,0 +1,32 @@
+#!/usr/bin/env python3
+# -*- encoding: utf-8; py-indent-offset: 4 -*-
+
+# This is free software;  you can redistribute it and/or modify it
+# under the  terms of the  GNU General Public License  as published by
+# the Free Software Foundation in version 2.  check_mk is  distributed
+# in the hope that it will be useful, but WITHOUT ANY WARRANTY;  with-
+# out even the implied warranty of  MERCHANTABILITY  or  FITNESS FOR A
+# PARTICULAR PURPOSE. See the  GNU General Public License for more de-
+# tails. You should have  received  a copy of the  GNU  General Public
+# License along with GNU Make; see the file  COPYING.  If  not,  write
+# to the Free Software Foundation, Inc., 51 Franklin St,  Fifth Floor,
+# Boston, MA 02110-1301 USA.
+
+# WAGNER AG
+# Developer: opensource@wagner.ch
+
+import time
+
+
+def test_deadline_skips_hanging_endpoint(agent, mock_server) -> None:
+    mock_server.hanging.add("monitor/router/bgp/neighbors")
+    specs = [spec for spec in agent._SECTIONS if spec.name in ("bgp_peer", "device_info")]
+    for fortios_class in (agent.FortiOS, agent.AsyncFortiOS):
+        fortios = fortios_class("127.0.0.1", mock_server.server_port, "token", False, 30, workers=2, deadline=1)
+        started = time.monotonic()
+        results = list(fortios.collect_sections(specs))
+        assert time.monotonic() - started < 5
+        assert [(result.spec.name, result.data is None, result.skipped) for result in results] == [
+            ("bgp_peer", True, True),
+            ("device_info", False, False),
+        ]
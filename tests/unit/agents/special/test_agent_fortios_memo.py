@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+# -*- encoding: utf-8; py-indent-offset: 4 -*-
+
+# This is free software;  you can redistribute it and/or modify it
+# under the  terms of the  GNU General Public License  as published by
+# the Free Software Foundation in version 2.  check_mk is  distributed
+# in the hope that it will be useful, but WITHOUT ANY WARRANTY;  with-
+# out even the implied warranty of  MERCHANTABILITY  or  FITNESS FOR A
+# PARTICULAR PURPOSE. See the  GNU General Public License for more de-
+# tails. You should have  received  a copy of the  GNU  General Public
+# License along with GNU Make; see the file  COPYING.  If  not,  write
+# to the Free Software Foundation, Inc., 51 Franklin St,  Fifth Floor,
+# Boston, MA 02110-1301 USA.
+
+# WAGNER AG
+# Developer: opensource@wagner.ch
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+
+def test_response_memo_shares_requests(agent) -> None:
+    memo = agent._ResponseMemo()
+    started = threading.Event()
+    release = threading.Event()
+    fetched = []
+
+    def fetch():
+        fetched.append(1)
+        started.set()
+        release.wait(5)
+        return {"results": []}
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        first = executor.submit(memo.get, ("path", ()), fetch)
+        started.wait(5)
+        others = [executor.submit(memo.get, ("path", ()), fetch) for _index in range(3)]
+        release.set()
+        results = [first.result(), *(future.result() for future in others)]
+
+    assert fetched == [1]
+    assert memo.hits == 3
+    assert all(result is results[0] for result in results)
+    assert memo.get(("other", ()), lambda: {"results": [1]}) == {"results": [1]}
+
+
+def test_response_memo_shares_exceptions(agent) -> None:
+    memo = agent._ResponseMemo()
+
+    def fetch():
+        raise agent.APIEndpointNotFound("HTTP 404")
+
+    for _index in range(2):
+        with pytest.raises(agent.APIEndpointNotFound):
+            memo.get(("path", ()), fetch)
+    assert memo.hits == 1
+
+
+@pytest.mark.parametrize(
+    "path, params, other_params",
+    [
+        ("v2/monitor/system/status", None, {}),
+        ("v2/cmdb/system/interface", {"format": "name", "count": "1"}, {"count": "1", "format": "name"}),
+    ],
+)
+def test_request_key(agent, path: str, params, other_params) -> None:
+    assert agent._request_key(path, params) == agent._request_key(path, other_params)
+    assert agent._request_key(path, params) != agent._request_key(path, {"start": "0"})
@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+# -*- encoding: utf-8; py-indent-offset: 4 -*-
+
+# This is free software;  you can redistribute it and/or modify it
+# under the  terms of the  GNU General Public License  as published by
+# the Free Software Foundation in version 2.  check_mk is  distributed
+# in the hope that it will be useful, but WITHOUT ANY WARRANTY;  with-
+# out even the implied warranty of  MERCHANTABILITY  or  FITNESS FOR A
+# PARTICULAR PURPOSE. See the  GNU General Public License for more de-
+# tails. You should have  received  a copy of the  GNU  General Public
+# License along with GNU Make; see the file  COPYING.  If  not,  write
+# to the Free Software Foundation, Inc., 51 Franklin St,  Fifth Floor,
+# Boston, MA 02110-1301 USA.
+
+# WAGNER AG
+# Developer: opensource@wagner.ch
+
+import asyncio
+import json
+
+import pytest
+
+PAGE_SIZE = 3
+PATH = "cmdb/system/interface"
+
+
+@pytest.fixture(name="spec")
+def fixture_spec(agent):
+    return next(spec for spec in agent._SECTIONS if spec.name == "interfaces_cmdb")
+
+
+@pytest.fixture(name="fortios", params=["threads", "asyncio"])
+def fixture_fortios(request, agent, mock_server):
+    fortios_class = agent.AsyncFortiOS if request.param == "asyncio" else agent.FortiOS
+    return fortios_class("127.0.0.1", mock_server.server_port, "token", False, 5, page_size=PAGE_SIZE)
+
+
+@pytest.fixture(name="table")
+def fixture_table(mock_server):
+    table = mock_server.fortigate.results(PATH, "root")
+    assert len(table) > 2 * PAGE_SIZE
+    return table
+
+
+def _collect(agent, fortios, spec):
+    if not isinstance(fortios, agent.AsyncFortiOS):
+        return fortios.collect_section_data(spec)
+
+    async def collect():
+        fortios._session.open()
+        try:
+            return await fortios.collect_section_data_async(spec)
+        finally:
+            await fortios._session.close()
+
+    return asyncio.run(collect())
+
+
+def _ignore_params(monkeypatch, mock_server, *names: str) -> None:
+    # like a FortiOS endpoint that does not know the paging parameters
+    envelope = mock_server.fortigate._envelope
+    monkeypatch.setattr(
+        mock_server.fortigate,
+        "_envelope",
+        lambda path, vdom, params: envelope(path, vdom, {key: value for key, value in params.items() if key not in names}),
+    )
+
+
+def test_paging_until_matched_count(agent, fortios, spec, mock_server, table) -> None:
+    data = _collect(agent, fortios, spec)
+
+    assert [entry["name"] for entry in data["results"]] == [entry["name"] for entry in table]
+    assert "size" not in data and "next_idx" not in data
+    assert mock_server.requests[PATH] == -(-len(table) // PAGE_SIZE)
+
+
+def test_paging_stops_on_short_page(agent, fortios, spec, mock_server, table, monkeypatch) -> None:
+    # monitor endpoints do not tell the size of the table
+    envelope = mock_server.fortigate._envelope
+    monkeypatch.setattr(
+        mock_server.fortigate,
+        "_envelope",
+        lambda path, vdom, params: {key: value for key, value in envelope(path, vdom, params).items() if key != "matched_count"},
+    )
+
+    data = _collect(agent, fortios, spec)
+
+    assert len(data["results"]) == len(table)
+    assert mock_server.requests[PATH] == len(table) // PAGE_SIZE + 1
+
+
+def test_paging_stops_when_count_is_ignored(agent, fortios, spec, mock_server, table, monkeypatch) -> None:
+    _ignore_params(monkeypatch, mock_server, "start", "count")
+
+    data = _collect(agent, fortios, spec)
+
+    assert len(data["results"]) == len(table)
+    assert mock_server.requests[PATH] == 1
+
+
+def test_paging_stops_when_start_is_ignored(agent, fortios, spec, mock_server, table, monkeypatch) -> None:
+    _ignore_params(monkeypatch, mock_server, "start")
+
+    data = _collect(agent, fortios, spec)
+
+    assert [entry["name"] for entry in data["results"]] == [entry["name"] for entry in table[:PAGE_SIZE]]
+    assert mock_server.requests[PATH] == 2
+
+
+def test_paging_stops_at_deadline(agent, fortios, spec, mock_server, monkeypatch) -> None:
+    monkeypatch.setattr(fortios, "_deadline_exceeded", lambda: True)
+
+    with pytest.raises(ValueError, match="Deadline exceeded"):
+        _collect(agent, fortios, spec)
+
+    assert mock_server.requests[PATH] == 1
+
+
+@pytest.mark.parametrize("count_ignored", [False, True])
+def test_streamed_pages(agent, fortios, mock_server, monkeypatch, count_ignored: bool) -> None:
+    # the DHCP leases are not cached, the threads backend writes them page by page
+    spec = next(spec for spec in agent._SECTIONS if spec.name == "dhcp_lease")
+    leases = mock_server.fortigate.results("monitor/system/dhcp", "root")
+    if count_ignored:
+        _ignore_params(monkeypatch, mock_server, "start", "count")
+
+    data = _collect(agent, fortios, spec)
+    if isinstance(data, agent._StreamedPayload):
+        data = data.materialize()
+
+    assert data["results"] == leases
+    assert data["status"] == "success"
+    assert mock_server.requests["monitor/system/dhcp"] == (1 if count_ignored else -(-len(leases) // PAGE_SIZE))
+
+
+def _chunks(data: bytes, size: int):
+    return (data[index : index + size] for index in range(0, len(data), size))
+
+
+def _pages(entries, page_size: int, **meta):
+    def fetch_page(start: int):
+        requests.append(start)
+        return {"status": "success", "results": entries[start : start + page_size], "size": page_size, "next_idx": start + page_size - 1, **meta}
+
+    requests: list[int] = []
+    return fetch_page, requests
+
+
+def test_paged_payload(agent) -> None:
+    entries = [{"id": index} for index in range(10)]
+    fetch_page, requests = _pages(entries, 4)
+    payload = agent._PagedPayload(fetch_page, 4, agent._RequestStats())
+
+    # the first page is requested right away, the next ones while the results are read
+    assert requests == [0]
+    assert payload.materialize() == {"status": "success", "results": entries}
+    assert requests == [0, 4, 8]
+
+
+def test_paged_payload_streamed_pages(agent) -> None:
+    entries = [{"id": index} for index in range(6)]
+
+    def fetch_page(start: int):
+        page = {"results": entries[start : start + 3], "matched_count": len(entries), "size": 3}
+        return agent._StreamedPayload(_chunks(json.dumps(page).encode(), 4))
+
+    payload = agent._PagedPayload(fetch_page, 3, agent._RequestStats())
+    assert list(payload.iter_results()) == entries
+    assert payload.meta == {"matched_count": 6}
+
+
+def test_paged_payload_without_results_list(agent) -> None:
+    requests = []
+
+    def fetch_page(start: int):
+        requests.append(start)
+        return {"status": "success", "results": {"cpu": 12}}
+
+    payload = agent._PagedPayload(fetch_page, 4, agent._RequestStats())
+    assert payload.materialize() == {"status": "success", "results": {"cpu": 12}}
+    assert requests == [0]
+
+
+def test_paged_payload_page_failed(agent) -> None:
+    entries = [{"id": index} for index in range(10)]
+    fetch_page, _requests = _pages(entries, 5)
+
+    def failing_fetch_page(start: int):
+        if start:
+            raise agent.APIEndpointNotFound("HTTP 500")
+        return fetch_page(start)
+
+    payload = agent._PagedPayload(failing_fetch_page, 5, agent._RequestStats())
+    with pytest.raises(ValueError, match="from 5 on"):
+        payload.materialize()
+
+
+@pytest.mark.parametrize(
+    "count, matched_count, received, last_page",
+    [
+        (10, None, 10, False),
+        (9, None, 19, True),
+        (0, None, 10, True),
+        (11, None, 11, True),
+        (10, 20, 20, True),
+        (10, 30, 20, False),
+    ],
+)
+def test_last_page(agent, count: int, matched_count, received: int, last_page: bool) -> None:
+    assert agent._last_page(count, 10, matched_count, received) is last_page
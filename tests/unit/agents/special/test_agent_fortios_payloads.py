@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+# -*- encoding: utf-8; py-indent-offset: 4 -*-
+
+# This is free software;  you can redistribute it and/or modify it
+# under the  terms of the  GNU General Public License  as published by
+# the Free Software Foundation in version 2.  check_mk is  distributed
+# in the hope that it will be useful, but WITHOUT ANY WARRANTY;  with-
+# out even the implied warranty of  MERCHANTABILITY  or  FITNESS FOR A
+# PARTICULAR PURPOSE. See the  GNU General Public License for more de-
+# tails. You should have  received  a copy of the  GNU  General Public
+# License along with GNU Make; see the file  COPYING.  If  not,  write
+# to the Free Software Foundation, Inc., 51 Franklin St,  Fifth Floor,
+# Boston, MA 02110-1301 USA.
+
+# WAGNER AG
+# Developer: opensource@wagner.ch
+
+import json
+
+import pytest
+
+RESPONSE = {
+    "http_method": "GET",
+    "results": [
+        {"name": "port1", "speed": 1000, "load": 1.5e-3, "alias": "Zürich \"uplink\" ✓", "tags": [], "vlan": None},
+        {"name": "port2", "speed": 10, "load": -2, "alias": "", "tags": [{"q_origin_key": "a"}], "vlan": {"id": 12}},
+        12345678901234567890,
+        "text, with ] and }",
+    ],
+    "vdom": "root",
+    "revision": "ab12",
+    "matched_count": 4,
+    "status": "success",
+}
+
+
+def _chunks(data: bytes, size: int):
+    return (data[index : index + size] for index in range(0, len(data), size))
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 7, 64, 1 << 20])
+@pytest.mark.parametrize("indent", [None, 2])
+def test_streamed_payload_chunked(agent, chunk_size: int, indent) -> None:
+    # multi-byte characters and numbers are split between chunks as well
+    content = json.dumps(RESPONSE, indent=indent, ensure_ascii=False).encode()
+    payload = agent._StreamedPayload(_chunks(content, chunk_size))
+
+    assert list(payload.iter_results()) == RESPONSE["results"]
+    assert payload.has_results_list
+    assert payload.meta == {key: value for key, value in RESPONSE.items() if key != "results"}
+
+
+@pytest.mark.parametrize(
+    "response",
+    [
+        {"status": "success", "results": {"cpu": 12}},
+        {"status": "success", "results": []},
+        {},
+    ],
+)
+def test_streamed_payload_materialize(agent, response) -> None:
+    payload = agent._StreamedPayload(_chunks(json.dumps(response).encode(), 3))
+    assert payload.materialize() == response
+
+
+@pytest.mark.parametrize(
+    "response, passed",
+    [
+        ({"status": "success", "results": [1, 2]}, True),
+        # the status behind the results is not read yet
+        ({"results": [1, 2], "status": "error"}, True),
+        ({"status": "error", "results": [1, 2]}, False),
+        ({"status": "error", "http_status": 404}, False),
+    ],
+)
+def test_streamed_payload_check_status(agent, response, passed: bool) -> None:
+    payload = agent._StreamedPayload(_chunks(json.dumps(response).encode(), 4))
+    if not passed:
+        with pytest.raises(ValueError):
+            payload.check_status()
+        return
+
+    payload.check_status()
+    if response["status"] == "success":
+        assert list(payload.iter_results()) == response["results"]
+        return
+    # the results read so far are returned, the status behind them fails the payload
+    with pytest.raises(ValueError):
+        list(payload.iter_results())
+
+
+def test_streamed_payload_decode_time(agent) -> None:
+    stats = agent._RequestStats()
+    content = json.dumps(RESPONSE).encode()
+    list(agent._StreamedPayload(_chunks(content, 5), stats).iter_results())
+    assert stats.decode_time > 0
+
+
+def test_results_decoder_yields_complete_entries(agent) -> None:
+    decoder = agent._JsonResultsDecoder()
+    assert list(decoder.feed('{"results": [{"a": 1}, {"b"')) == [{"a": 1}]
+    assert list(decoder.feed(': 2}, 12')) == [{"b": 2}]
+    # 12 may continue in the next chunk
+    assert list(decoder.feed('3]')) == [123]
+    assert list(decoder.feed(', "size": 3}', final=True)) == []
+    assert decoder.meta == {"size": 3}
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        '[{"results": []}]',
+        '{"results": [1, 2',
+        '{"results": [1, 2]',
+        '{"results": [1, }',
+    ],
+)
+def test_results_decoder_rejects(agent, text: str) -> None:
+    decoder = agent._JsonResultsDecoder()
+    with pytest.raises(ValueError):
+        list(decoder.feed(text, final=True))
@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+# -*- encoding: utf-8; py-indent-offset: 4 -*-
+
+# This is free software;  you can redistribute it and/or modify it
+# under the  terms of the  GNU General Public License  as published by
+# the Free Software Foundation in version 2.  check_mk is  distributed
+# in the hope that it will be useful, but WITHOUT ANY WARRANTY;  with-
+# out even the implied warranty of  MERCHANTABILITY  or  FITNESS FOR A
+# PARTICULAR PURPOSE. See the  GNU General Public License for more de-
+# tails. You should have  received  a copy of the  GNU  General Public
+# License along with GNU Make; see the file  COPYING.  If  not,  write
+# to the Free Software Foundation, Inc., 51 Franklin St,  Fifth Floor,
+# Boston, MA 02110-1301 USA.
+
+# WAGNER AG
+# Developer: opensource@wagner.ch
+
+import re
+
+import pytest
+
+
+def _sections(output: str) -> list[tuple[str, str]]:
+    # the piggyback headers as well, every switch has its own sections.
+    # The stats hold the timing of the requests, they differ between two runs
+    sections = re.findall(r"^(<<<[^\n]*>>>)\n((?:(?!<<<)[^\n]*\n)*)", output, re.MULTILINE)
+    return [(header, body) for header, body in sections if not header.startswith("<<<fortios_agent_stats")]
+
+
+def _run(agent, capsys, *argv: str) -> str:
+    assert agent.agent_fortios(agent.parse_arguments(["--no-cert-check", "--api-token", "token", "--page-size", "3", *argv, "127.0.0.1"])) == 0
+    return capsys.readouterr().out
+
+
+@pytest.mark.parametrize("backend", ["threads", "asyncio"])
+def test_replay_matches_recording(agent, mock_server, tmp_path, capsys, backend: str) -> None:
+    port = ["--port", str(mock_server.server_port)]
+    recorded = _run(agent, capsys, *port, "--backend", backend, "--record", str(tmp_path))
+    requests = dict(mock_server.requests)
+
+    replayed = _run(agent, capsys, *port, "--backend", backend, "--replay", str(tmp_path), "--replay-timing", "none")
+
+    assert _sections(replayed) == _sections(recorded)
+    assert len(_sections(recorded)) > 10
+    # everything came from the recording
+    assert mock_server.requests == requests
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+# -*- encoding: utf-8; py-indent-offset: 4 -*-
+
+# This is free software;  you can redistribute it and/or modify it
+# under the  terms of the  GNU General Public License  as published by
+# the Free Software Foundation in version 2.  check_mk is  distributed
+# in the hope that it will be useful, but WITHOUT ANY WARRANTY;  with-
+# out even the implied warranty of  MERCHANTABILITY  or  FITNESS FOR A
+# PARTICULAR PURPOSE. See the  GNU General Public License for more de-
+# tails. You should have  received  a copy of the  GNU  General Public
+# License along with GNU Make; see the file  COPYING.  If  not,  write
+# to the Free Software Foundation, Inc., 51 Franklin St,  Fifth Floor,
+# Boston, MA 02110-1301 USA.
+
+# WAGNER AG
+# Developer: opensource@wagner.ch
+
+import json
+
+import pytest
+
+
+def _spec(agent, name: str):
+    return next(spec for spec in agent._SECTIONS if spec.name == name)
+
+
+def _fortios(agent, mock_server, backend: str = "threads", timeout: int = 5, **kwargs):
+    fortios_class = agent.AsyncFortiOS if backend == "asyncio" else agent.FortiOS
+    return fortios_class("127.0.0.1", mock_server.server_port, "token", False, timeout, **kwargs)
+
+
+def _collect(fortios, spec):
+    [result] = fortios.collect_sections([spec])
+    return result
+
+
+def test_circuit_breaker(agent, tmp_path) -> None:
+    spec = _spec(agent, "bgp_peer")
+    breaker = agent._CircuitBreaker(tmp_path / "circuit_breaker.json", 2, 600)
+    breaker.start_run()
+
+    breaker.record_timeout(spec)
+    assert not breaker.is_open(spec)
+    breaker.record_timeout(spec)
+    assert breaker.is_open(spec)
+    breaker.save()
+
+    # the next run of the agent
+    breaker = agent._CircuitBreaker(tmp_path / "circuit_breaker.json", 2, 600)
+    breaker.start_run()
+    assert breaker.is_open(spec)
+    assert not breaker.is_open(_spec(agent, "device_info"))
+
+    breaker.record_response(spec)
+    assert not breaker.is_open(spec)
+    breaker.save()
+    assert json.loads((tmp_path / "circuit_breaker.json").read_text()) == {}
+
+
+def test_circuit_breaker_closes_after_cooldown(agent, tmp_path) -> None:
+    spec = _spec(agent, "bgp_peer")
+    breaker = agent._CircuitBreaker(tmp_path / "circuit_breaker.json", 1, 0)
+    breaker.start_run()
+    breaker.record_timeout(spec)
+    # the cooldown is over, the next request is let through
+    assert not breaker.is_open(spec)
+
+
+def test_circuit_breaker_stops_hanging_endpoint(agent, mock_server, tmp_path) -> None:
+    mock_server.hanging.add("monitor/router/bgp/neighbors")
+    spec = _spec(agent, "bgp_peer")
+    breaker = agent._CircuitBreaker(tmp_path / "circuit_breaker.json", 1, 600)
+    fortios = _fortios(agent, mock_server, circuit_breaker=breaker, timeout=1)
+
+    assert _collect(fortios, spec).data is None
+    assert _collect(fortios, spec).data is None
+    assert mock_server.requests["monitor/router/bgp/neighbors"] == 1
+
+
+@pytest.mark.parametrize("retries, collected", [(0, False), (1, True)])
+def test_retry_after_server_error(agent, mock_server, monkeypatch, retries: int, collected: bool) -> None:
+    failed_paths = set()
+    response = mock_server.fortigate.response
+
+    def fail_once(path, params):
+        if path in failed_paths:
+            return response(path, params)
+        failed_paths.add(path)
+        return 503, {"http_status": 503, "status": "error"}
+
+    monkeypatch.setattr(mock_server.fortigate, "response", fail_once)
+    monkeypatch.setattr(agent, "_RETRY_BASE_DELAY", 0.01)
+    for fortios_class in (agent.FortiOS, agent.AsyncFortiOS):
+        failed_paths.clear()
+        fortios = fortios_class("127.0.0.1", mock_server.server_port, "token", False, 5, retries=retries)
+        [result] = fortios.collect_sections([next(spec for spec in agent._SECTIONS if spec.name == "device_info")])
+        assert (result.data is not None) is collected
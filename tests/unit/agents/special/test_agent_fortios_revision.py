@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+# -*- encoding: utf-8; py-indent-offset: 4 -*-
+
+# This is free software;  you can redistribute it and/or modify it
+# under the  terms of the  GNU General Public License  as published by
+# the Free Software Foundation in version 2.  check_mk is  distributed
+# in the hope that it will be useful, but WITHOUT ANY WARRANTY;  with-
+# out even the implied warranty of  MERCHANTABILITY  or  FITNESS FOR A
+# PARTICULAR PURPOSE. See the  GNU General Public License for more de-
+# tails. You should have  received  a copy of the  GNU  General Public
+# License along with GNU Make; see the file  COPYING.  If  not,  write
+# to the Free Software Foundation, Inc., 51 Franklin St,  Fifth Floor,
+# Boston, MA 02110-1301 USA.
+
+# WAGNER AG
+# Developer: opensource@wagner.ch
+
+import json
+import time
+
+import pytest
+
+
+def _spec(agent, name: str):
+    return next(spec for spec in agent._SECTIONS if spec.name == name)
+
+
+def _fortios(agent, mock_server, backend: str = "threads", timeout: int = 5, **kwargs):
+    fortios_class = agent.AsyncFortiOS if backend == "asyncio" else agent.FortiOS
+    return fortios_class("127.0.0.1", mock_server.server_port, "token", False, timeout, **kwargs)
+
+
+def _collect(fortios, spec):
+    [result] = fortios.collect_sections([spec])
+    return result
+
+
+def _store_expired(cache, spec, data) -> None:
+    cache.store(spec, data)
+    cache._file(spec).write_text(json.dumps({"timestamp": time.time() - spec.cache_ttl - 1, "data": data}))
+
+
+@pytest.mark.parametrize("backend", ["threads", "asyncio"])
+def test_expired_cmdb_section_with_unchanged_revision(agent, mock_server, tmp_path, backend: str) -> None:
+    cache = agent._SectionCache(tmp_path)
+    spec = _spec(agent, "dhcp_scope")
+    cached = {"status": "success", "revision": mock_server.fortigate.revision, "results": [{"id": 1}]}
+    _store_expired(cache, spec, cached)
+
+    result = _collect(_fortios(agent, mock_server, backend, cache=cache), spec)
+
+    # only the single entry of the revision probe is requested
+    assert result.revalidated
+    assert result.data == cached
+    assert mock_server.requests["cmdb/system.dhcp/server"] == 1
+    assert cache.load(spec).age < 5
+
+
+@pytest.mark.parametrize("backend", ["threads", "asyncio"])
+def test_expired_cmdb_section_with_changed_revision(agent, mock_server, tmp_path, backend: str) -> None:
+    cache = agent._SectionCache(tmp_path)
+    spec = _spec(agent, "dhcp_scope")
+    _store_expired(cache, spec, {"status": "success", "revision": "0" * 32 + "1", "results": [{"id": 1}]})
+
+    result = _collect(_fortios(agent, mock_server, backend, cache=cache), spec)
+
+    assert not result.from_cache
+    assert result.data["revision"] == mock_server.fortigate.revision
+    assert mock_server.requests["cmdb/system.dhcp/server"] == 2
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+# -*- encoding: utf-8; py-indent-offset: 4 -*-
+
+# This is free software;  you can redistribute it and/or modify it
+# under the  terms of the  GNU General Public License  as published by
+# the Free Software Foundation in version 2.  check_mk is  distributed
+# in the hope that it will be useful, but WITHOUT ANY WARRANTY;  with-
+# out even the implied warranty of  MERCHANTABILITY  or  FITNESS FOR A
+# PARTICULAR PURPOSE. See the  GNU General Public License for more de-
+# tails. You should have  received  a copy of the  GNU  General Public
+# License along with GNU Make; see the file  COPYING.  If  not,  write
+# to the Free Software Foundation, Inc., 51 Franklin St,  Fifth Floor,
+# Boston, MA 02110-1301 USA.
+
+# WAGNER AG
+# Developer: opensource@wagner.ch
+
+import json
+import time
+
+import pytest
+
+
+@pytest.fixture(name="fortios", params=["threads", "asyncio"])
+def fixture_fortios(request, agent, mock_server):
+    fortios_class = agent.AsyncFortiOS if request.param == "asyncio" else agent.FortiOS
+    return fortios_class("127.0.0.1", mock_server.server_port, "token", False, 5, workers=4)
+
+
+def _spec(agent, name: str):
+    return next(spec for spec in agent._SECTIONS if spec.name == name)
+
+
+def _fortios(agent, mock_server, backend: str = "threads", timeout: int = 5, **kwargs):
+    fortios_class = agent.AsyncFortiOS if backend == "asyncio" else agent.FortiOS
+    return fortios_class("127.0.0.1", mock_server.server_port, "token", False, timeout, **kwargs)
+
+
+def _collect(fortios, spec):
+    [result] = fortios.collect_sections([spec])
+    return result
+
+
+def _store_expired(cache, spec, data) -> None:
+    cache.store(spec, data)
+    cache._file(spec).write_text(json.dumps({"timestamp": time.time() - spec.cache_ttl - 1, "data": data}))
+
+
+def test_missing_endpoint(agent, fortios, mock_server) -> None:
+    mock_server.missing.add("monitor/router/bgp/neighbors")
+    results = list(fortios.collect_sections([spec for spec in agent._SECTIONS if spec.name in ("bgp_peer", "device_info")]))
+    assert [(result.spec.name, result.data is None, result.stats.status_code) for result in results] == [
+        ("bgp_peer", True, 404),
+        ("device_info", False, 200),
+    ]
+
+
+def test_failed_section_reports_the_fallback(agent, mock_server, tmp_path) -> None:
+    cache = agent._SectionCache(tmp_path)
+    spec = _spec(agent, "device_info")
+    _store_expired(cache, spec, {"status": "success", "results": {"hostname": "old"}})
+    mock_server.missing.add("monitor/system/status")
+
+    result = _collect(_fortios(agent, mock_server, cache=cache), spec)
+    (stats,) = agent._agent_stats([result])
+
+    assert result.fallback
+    assert stats["status_code"] == 404
+    assert stats["from_cache"] and stats["fallback"]
+    assert stats["cache_age"] >= spec.cache_ttl
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+# -*- encoding: utf-8; py-indent-offset: 4 -*-
+
+# This is free software;  you can redistribute it and/or modify it
+# under the  terms of the  GNU General Public License  as published by
+# the Free Software Foundation in version 2.  check_mk is  distributed
+# in the hope that it will be useful, but WITHOUT ANY WARRANTY;  with-
+# out even the implied warranty of  MERCHANTABILITY  or  FITNESS FOR A
+# PARTICULAR PURPOSE. See the  GNU General Public License for more de-
+# tails. You should have  received  a copy of the  GNU  General Public
+# License along with GNU Make; see the file  COPYING.  If  not,  write
+# to the Free Software Foundation, Inc., 51 Franklin St,  Fifth Floor,
+# Boston, MA 02110-1301 USA.
+
+# WAGNER AG
+# Developer: opensource@wagner.ch
+
+import json
+import time
+from dataclasses import replace
+
+import pytest
+
+
+def _spec(agent, name: str):
+    return next(spec for spec in agent._SECTIONS if spec.name == name)
+
+
+def _fortios(agent, mock_server, backend: str = "threads", timeout: int = 5, **kwargs):
+    fortios_class = agent.AsyncFortiOS if backend == "asyncio" else agent.FortiOS
+    return fortios_class("127.0.0.1", mock_server.server_port, "token", False, timeout, **kwargs)
+
+
+@pytest.mark.parametrize(
+    "data, cpu",
+    [
+        ({"status": "success", "results": {"cpu": 85}}, 85),
+        ([{"results": {"cpu": 40}}, {"results": {"cpu": 45}}], 85),
+        ({"status": "error"}, None),
+    ],
+)
+def test_throttle_update(agent, data, cpu) -> None:
+    throttle = agent._Throttle(None, 80, 0.0, 4)
+    throttle.start_run()
+    throttle.update(data)
+    assert throttle.cpu == cpu
+    assert throttle.active is (cpu is not None)
+
+
+def test_throttle_cache_ttl(agent) -> None:
+    throttle = agent._Throttle(None, 80, 0.0, 4)
+    throttle.start_run()
+    dhcp_scope = _spec(agent, "dhcp_scope")
+    high_priority = replace(dhcp_scope, priority=agent._PRIORITY_HIGH)
+
+    assert throttle.cache_ttl(dhcp_scope) == dhcp_scope.cache_ttl
+    throttle.update({"results": {"cpu": 95}})
+    assert throttle.cache_ttl(dhcp_scope) == 4 * dhcp_scope.cache_ttl
+    assert throttle.cache_ttl(high_priority) == dhcp_scope.cache_ttl
+    assert throttle.cache_ttl(_spec(agent, "bgp_peer")) is None
+
+
+def test_throttle_load_of_last_run(agent, tmp_path) -> None:
+    load_file = tmp_path / "load.json"
+    throttle = agent._Throttle(load_file, 80, 0.0, 4)
+    throttle.start_run()
+    throttle.update({"results": {"cpu": 95}})
+    throttle.save()
+
+    throttle.start_run()
+    assert throttle.active
+
+    load_file.write_text(json.dumps({"timestamp": time.time() - agent._LOAD_MAX_AGE - 1, "cpu": 95}))
+    throttle.start_run()
+    assert not throttle.active
+
+
+@pytest.mark.parametrize("backend", ["threads", "asyncio"])
+def test_throttle_reads_the_load(agent, mock_server, tmp_path, backend: str) -> None:
+    mock_server.fortigate.config = replace(mock_server.fortigate.config, cpu=95)
+    throttle = agent._Throttle(tmp_path / "load.json", 80, 0.0, 4)
+    fortios = _fortios(agent, mock_server, backend, throttle=throttle)
+
+    results = list(fortios.collect_sections([_spec(agent, "vdom_resources"), _spec(agent, "bgp_peer")]))
+
+    assert all(result.data is not None for result in results)
+    assert json.loads((tmp_path / "load.json").read_text())["cpu"] == 95
+    throttle.start_run()
+    assert throttle.active
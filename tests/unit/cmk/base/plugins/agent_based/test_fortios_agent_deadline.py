@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+# -*- encoding: utf-8; py-indent-offset: 4 -*-
+
+# This is free software;  you can redistribute it and/or modify it
+# under the  terms of the  GNU General Public License  as published by
+# the Free Software Foundation in version 2.  check_mk is  distributed
+# in the hope that it will be useful, but WITHOUT ANY WARRANTY;  with-
+# out even the implied warranty of  MERCHANTABILITY  or  FITNESS FOR A
+# PARTICULAR PURPOSE. See the  GNU General Public License for more de-
+# tails. You should have  received  a copy of the  GNU  General Public
+# License along with GNU Make; see the file  COPYING.  If  not,  write
+# to the Free Software Foundation, Inc., 51 Franklin St,  Fifth Floor,
+# Boston, MA 02110-1301 USA.
+
+# WAGNER AG
+# Developer: opensource@wagner.ch
+
+from typing import Tuple
+
+import pytest
+from cmk.base.plugins.agent_based.agent_based_api.v1 import (
+    Metric,
+    Result,
+    State,
+)
+from cmk.base.plugins.agent_based.fortios_agent_deadline import (
+    AgentDeadline,
+    check_fortios_agent_deadline,
+    parse_fortios_agent_deadline,
+)
+
+
+@pytest.mark.parametrize(
+    "string_table, expected_section",
+    [
+        (
+            [['{"deadline": 30, "elapsed": 12.5, "skipped": [], "cached": []}']],
+            AgentDeadline(deadline=30, elapsed=12.5),
+        ),
+        (
+            [['{"deadline": 5, "elapsed": 5.002, "skipped": ["ntp", "bgp_peer"], "cached": ["license"]}']],
+            AgentDeadline(deadline=5, elapsed=5.002, skipped=["ntp", "bgp_peer"], cached=["license"]),
+        ),
+        (
+            [],
+            None,
+        ),
+    ],
+)
+def test_parse_fortios_agent_deadline(string_table, expected_section) -> None:
+    assert parse_fortios_agent_deadline(string_table) == expected_section
+
+
+@pytest.mark.parametrize(
+    "section, expected_check_result",
+    [
+        (
+            AgentDeadline(deadline=30, elapsed=12.5),
+            [
+                Result(state=State.OK, summary="Collected in 12.5s (deadline: 30s)"),
+                Metric("fortios_agent_elapsed", 12.5, boundaries=(0, 30)),
+            ],
+        ),
+        (
+            AgentDeadline(deadline=5, elapsed=5.002, skipped=["ntp", "bgp_peer"], cached=["license"]),
+            [
+                Result(state=State.OK, summary="Collected in 5.0s (deadline: 5s)"),
+                Result(state=State.WARN, summary="Served from cache: license"),
+                Result(state=State.CRIT, summary="Dropped: ntp, bgp_peer"),
+                Metric("fortios_agent_elapsed", 5.002, boundaries=(0, 5)),
+            ],
+        ),
+    ],
+)
+def test_check_fortios_agent_deadline(section: AgentDeadline, expected_check_result: Tuple) -> None:
+    assert list(check_fortios_agent_deadline(section)) == expected_check_result
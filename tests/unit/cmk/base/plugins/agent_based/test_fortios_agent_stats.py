@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+# -*- encoding: utf-8; py-indent-offset: 4 -*-
+
+# This is free software;  you can redistribute it and/or modify it
+# under the  terms of the  GNU General Public License  as published by
+# the Free Software Foundation in version 2.  check_mk is  distributed
+# in the hope that it will be useful, but WITHOUT ANY WARRANTY;  with-
+# out even the implied warranty of  MERCHANTABILITY  or  FITNESS FOR A
+# PARTICULAR PURPOSE. See the  GNU General Public License for more de-
+# tails. You should have  received  a copy of the  GNU  General Public
+# License along with GNU Make; see the file  COPYING.  If  not,  write
+# to the Free Software Foundation, Inc., 51 Franklin St,  Fifth Floor,
+# Boston, MA 02110-1301 USA.
+
+# WAGNER AG
+# Developer: opensource@wagner.ch
+
+from typing import Tuple
+
+import pytest
+from cmk.base.plugins.agent_based.agent_based_api.v1 import (
+    Metric,
+    Result,
+    Service,
+    State,
+)
+from cmk.base.plugins.agent_based.fortios_agent_stats import (
+    EndpointStats,
+    check_fortios_agent_stats,
+    discovery_fortios_agent_stats,
+    parse_fortios_agent_stats,
+)
+
+STATUS = EndpointStats(name="managed_switch", path="monitor/switch-controller/managed-switch/status", status_code=200, latency=0.25, wire_bytes=167, body_bytes=329, decode_time=0.0005)
+IPSEC = EndpointStats(name="ipsec", path="monitor/vpn/ipsec?vdom=*", status_code=200, latency=0.1, wire_bytes=128, body_bytes=137, decode_time=0.00002)
+CMDB = EndpointStats(name="interfaces_cmdb", path="cmdb/system/interface", from_cache=True)
+BGP = EndpointStats(name="bgp_peer", path="monitor/router/bgp/neighbors", unsupported=True)
+
+
+@pytest.mark.parametrize(
+    "string_table, expected_section",
+    [
+        (
+            [
+                [
+                    '{"sections": ['
+                    '{"name": "managed_switch", "path": "monitor/switch-controller/managed-switch/status", "status_code": 200, "latency": 0.25, "wire_bytes": 167, "body_bytes": 329, "decode_time": 0.0005, "from_cache": false}, '
+                    '{"name": "managed_switch_status", "path": "monitor/switch-controller/managed-switch/status", "status_code": 200, "latency": 0.25, "wire_bytes": 167, "body_bytes": 329, "decode_time": 0.0005, "from_cache": false}, '
+                    '{"name": "ipsec", "path": "monitor/vpn/ipsec?vdom=*", "status_code": 200, "latency": 0.1, "wire_bytes": 128, "body_bytes": 137, "decode_time": 0.00002, "from_cache": false}, '
+                    '{"name": "interfaces_cmdb", "path": "cmdb/system/interface", "status_code": null, "latency": 0.0, "wire_bytes": 0, "body_bytes": 0, "decode_time": 0.0, "from_cache": true}, '
+                    '{"name": "bgp_peer", "path": "monitor/router/bgp/neighbors", "status_code": null, "latency": 0.0, "wire_bytes": 0, "body_bytes": 0, "decode_time": 0.0, "from_cache": false, "unsupported": true}'
+                    "]}"
+                ]
+            ],
+            {
+                "monitor/switch-controller/managed-switch/status": STATUS,
+                "monitor/vpn/ipsec": IPSEC,
+                "cmdb/system/interface": CMDB,
+                "monitor/router/bgp/neighbors": BGP,
+            },
+        ),
+        (
+            [],
+            None,
+        ),
+    ],
+)
+def test_parse_fortios_agent_stats(string_table, expected_section) -> None:
+    assert parse_fortios_agent_stats(string_table) == expected_section
+
+
+def test_discovery_fortios_agent_stats() -> None:
+    assert list(discovery_fortios_agent_stats({"monitor/vpn/ipsec": IPSEC, "cmdb/system/interface": CMDB, "monitor/router/bgp/neighbors": BGP})) == [
+        Service(item="monitor/vpn/ipsec"),
+        Service(item="cmdb/system/interface"),
+    ]
+
+
+@pytest.mark.parametrize(
+    "item, section, expected_check_result",
+    [
+        (
+            "monitor/vpn/ipsec",
+            {"monitor/vpn/ipsec": IPSEC},
+            [
+                Result(state=State.OK, summary="HTTP status: 200"),
+                Result(state=State.OK, summary="Latency: 100 ms"),
+                Result(state=State.OK, summary="Received: 128 B (137 B decoded)"),
+                Result(state=State.OK, notice="Decode time: 0.0 ms"),
+                Metric("fortios_api_latency", 0.1),
+                Metric("fortios_api_wire_bytes", 128),
+                Metric("fortios_api_body_bytes", 137),
+                Metric("fortios_api_decode_time", 0.00002),
+            ],
+        ),
+        (
+            "monitor/router/bgp/neighbors",
+            {"monitor/router/bgp/neighbors": EndpointStats(name="bgp_peer", path="monitor/router/bgp/neighbors", status_code=404, latency=0.3)},
+            [
+                Result(state=State.WARN, summary="HTTP status: 404"),
+                Result(state=State.OK, summary="Latency: 300 ms"),
+                Result(state=State.OK, summary="Received: 0 B (0 B decoded)"),
+                Result(state=State.OK, notice="Decode time: 0.0 ms"),
+                Metric("fortios_api_latency", 0.3),
+                Metric("fortios_api_wire_bytes", 0),
+                Metric("fortios_api_body_bytes", 0),
+                Metric("fortios_api_decode_time", 0.0),
+            ],
+        ),
+        (
+            "cmdb/system/interface",
+            {"cmdb/system/interface": CMDB},
+            [
+                Result(state=State.OK, summary="Served from cache"),
+            ],
+        ),
+        (
+            "cmdb/system/interface",
+            {"cmdb/system/interface": EndpointStats(name="interfaces_cmdb", path="cmdb/system/interface", status_code=500, latency=0.2, from_cache=True, cache_age=5400, fallback=True)},
+            [
+                Result(state=State.WARN, summary="Request failed (HTTP status: 500), served from cache of 1 hour 30 minutes ago"),
+            ],
+        ),
+        (
+            "cmdb/system/interface",
+            {"cmdb/system/interface": EndpointStats(name="interfaces_cmdb", path="cmdb/system/interface", from_cache=True, fallback=True)},
+            [
+                Result(state=State.WARN, summary="Request failed (HTTP status: none), served from cache"),
+            ],
+        ),
+        (
+            "monitor/router/bgp/neighbors",
+            {"monitor/router/bgp/neighbors": BGP},
+            [
+                Result(state=State.OK, summary="Not supported by the FortiGate"),
+            ],
+        ),
+        (
+            "monitor/system/ntp/status",
+            {"monitor/system/ntp/status": EndpointStats(name="ntp", path="monitor/system/ntp/status")},
+            [
+                Result(state=State.WARN, summary="Not requested"),
+            ],
+        ),
+    ],
+)
+def test_check_fortios_agent_stats(item: str, section, expected_check_result: Tuple) -> None:
+    assert list(check_fortios_agent_stats(item, section)) == expected_check_result
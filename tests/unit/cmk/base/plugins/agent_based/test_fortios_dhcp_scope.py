@@ -15,6 +15,8 @@
 # WAGNER AG
 # Developer: opensource@wagner.ch
 
+from unittest.mock import patch
+
 import pytest
 from cmk.base.plugins.agent_based.agent_based_api.v1 import (
     Metric,
@@ -23,6 +25,8 @@ from cmk.base.plugins.agent_based.agent_based_api.v1 import (
 )
 from cmk.base.plugins.agent_based.fortios_dhcp_lease import (
     DhcpLease,
+    DhcpLeaseSection,
+    ServerLeases,
     parse_fortios_dhcp_lease,
 )
 from cmk.base.plugins.agent_based.fortios_dhcp_scope import (
@@ -82,7 +86,8 @@ from cmk.base.plugins.agent_based.fortios_dhcp_scope import (
                         vci_string=[],
                         uci_match="disable",
                         uci_string=[],
-                        lease_time=0)],
+                        lease_time=0,
+                        size=155)],
                         timezone_option="disable",
                         timezone="00",
                         tftp_server=[],
@@ -156,17 +161,20 @@ from cmk.base.plugins.agent_based.fortios_dhcp_scope import (
                                 description=""
                             ),
                         ],
+                        ip_count=155,
                     ),
                 }
             ],
         ),
     ],
 )
-def test_parse_fortios_dhcp_scope(string_table, expected_section) -> None:
-    assert parse_fortios_dhcp_scope(string_table) == expected_section[0]
+@pytest.mark.parametrize("validate", [False, True])
+def test_parse_fortios_dhcp_scope(string_table, expected_section, validate: bool) -> None:
+    with patch("cmk.utils.debug.enabled", return_value=validate):
+        assert parse_fortios_dhcp_scope(string_table) == expected_section[0]
 
 @pytest.mark.parametrize(
-    "string_table, expected_section",
+    "string_table, expected_servers, expected_rows",
     [
         (
             [
@@ -174,55 +182,59 @@ def test_parse_fortios_dhcp_scope(string_table, expected_section) -> None:
                     '{"http_method":"GET","results":[{"ip":"10.128.1.112","reserved":true,"mac":"aa:aa:bb:bb:ee:ee","vci":"FortiSwitch-448E-FPOE","hostname":"switch03","expire_time":1724645152,"status":"leased","interface":"fortilink","type":"ipv4","server_mkey":3,"server_ipam_enabled":false},{"ip":"10.128.1.111","reserved":true,"mac":"aa:aa:bb:bb:dd:dd","vci":"FortiSwitch-424E-FPOE","hostname":"switch02","expire_time":1724645151,"status":"leased","interface":"fortilink","type":"ipv4","server_mkey":3,"server_ipam_enabled":false},{"ip":"10.128.1.110","reserved":true,"mac":"aa:aa:bb:bb:cc:cc","vci":"FortiSwitch-424E-FPOE","hostname":"switch01","expire_time":1724645153,"status":"leased","interface":"fortilink","type":"ipv4","server_mkey":3,"server_ipam_enabled":false}],"vdom":"root","path":"system","name":"dhcp","action":"","status":"success","serial":"FG200FT123456789","version":"v7.2.8","build":1639}'
                 ]
             ],
+            {3: ServerLeases(count=3, statuses={"leased": 3})},
+            [("10.128.1.112", "aa:aa:bb:bb:ee:ee", "fortilink"), ("10.128.1.111", "aa:aa:bb:bb:dd:dd", "fortilink"), ("10.128.1.110", "aa:aa:bb:bb:cc:cc", "fortilink")],
+        ),
+        (
             [
-                {
-                    "aa:aa:bb:bb:cc:cc": DhcpLease(
-                        ip="10.128.1.110",
-                        reserved=True,
-                        mac="aa:aa:bb:bb:cc:cc",
-                        vci="FortiSwitch-424E-FPOE",
-                        hostname="switch01",
-                        expire_time=1724645153,
-                        status="leased",
-                        interface="fortilink",
-                        type="ipv4",
-                        server_mkey=3,
-                        server_ipam_enabled=False
-                    ),
-                    "aa:aa:bb:bb:dd:dd": DhcpLease(
-                        ip="10.128.1.111",
-                        reserved=True,
-                        mac="aa:aa:bb:bb:dd:dd",
-                        vci="FortiSwitch-424E-FPOE",
-                        hostname="switch02",
-                        expire_time=1724645151,
-                        status="leased",
-                        interface="fortilink",
-                        type="ipv4",
-                        server_mkey=3,
-                        server_ipam_enabled=False
-                    ),
-                    "aa:aa:bb:bb:ee:ee": DhcpLease(
-                        ip="10.128.1.112",
-                        reserved=True,
-                        mac="aa:aa:bb:bb:ee:ee",
-                        vci="FortiSwitch-448E-FPOE",
-                        hostname="switch03",
-                        expire_time=1724645152,
-                        status="leased",
-                        interface="fortilink",
-                        type="ipv4",
-                        server_mkey=3,
-                        server_ipam_enabled=False
-                    ),
-                },
+                [
+                    '{"http_method":"GET","results":[{"ip":"10.128.1.110","reserved":false,"mac":"aa:aa:bb:bb:cc:cc","hostname":"laptop01","expire_time":1724645153,"status":"leased","interface":"fortilink","type":"ipv4","server_mkey":3,"server_ipam_enabled":false},{"ip":"10.128.2.110","reserved":false,"mac":"aa:aa:bb:bb:cc:cc","hostname":"laptop01","expire_time":1724645154,"status":"conflicted","interface":"lan","type":"ipv4","server_mkey":4,"server_ipam_enabled":false}],"vdom":"root","path":"system","name":"dhcp","action":"","status":"success","serial":"FG200FT123456789","version":"v7.2.8","build":1639}'
+                ]
             ],
+            {
+                3: ServerLeases(count=1, statuses={"leased": 1}),
+                4: ServerLeases(
+                    count=1,
+                    statuses={"conflicted": 1},
+                    conflicted=[
+                        DhcpLease(ip="10.128.2.110", reserved=False, mac="aa:aa:bb:bb:cc:cc", vci=None, hostname="laptop01", expire_time=1724645154, status="conflicted", interface="lan", type="ipv4", server_mkey=4, server_ipam_enabled=False),
+                    ],
+                ),
+            },
+            [("10.128.1.110", "aa:aa:bb:bb:cc:cc", "fortilink"), ("10.128.2.110", "aa:aa:bb:bb:cc:cc", "lan")],
+        ),
+        (
+            [
+                [
+                    '{"http_method":"GET","results":[{"ip":"10.128.1.110","reserved":false,"mac":"aa:aa:bb:bb:cc:cc:dd:dd:ee","expire_time":1724645153,"status":"leased","interface":"fortilink","type":"ipv4","server_mkey":3,"server_ipam_enabled":false},{"reserved":false,"mac":"not a mac","status":"leased","interface":"fortilink","type":"ipv6","server_mkey":3,"server_ipam_enabled":false}],"vdom":"root","path":"system","name":"dhcp","action":"select","status":"success","serial":"Serial01","version":"v7.2.8","build":1639}'
+                ]
+            ],
+            {3: ServerLeases(count=2, statuses={"leased": 2})},
+            # neither the too long MAC address nor the lease without IPv4 address spill into other rows
+            [("10.128.1.110", None, "fortilink"), (None, None, "fortilink")],
         ),
     ],
 )
+@pytest.mark.parametrize("validate", [False, True])
+def test_parse_fortios_dhcp_lease(string_table, expected_servers, expected_rows, validate: bool) -> None:
+    with patch("cmk.utils.debug.enabled", return_value=validate):
+        section = parse_fortios_dhcp_lease(string_table)
+    assert section.servers == expected_servers
+    assert [(section.ip_address(row), section.mac_address(row), section.interface_name(row)) for row in range(len(section))] == expected_rows
+
 
-def test_parse_fortios_dhcp_lease(string_table, expected_section) -> None:
-    assert parse_fortios_dhcp_lease(string_table) == expected_section[0]
+def test_dhcp_lease_expiring() -> None:
+    section = DhcpLeaseSection.from_leases(
+        [
+            {"ip": "10.128.1.110", "reserved": False, "expire_time": 1000, "status": "leased", "server_mkey": 3},
+            {"ip": "10.128.1.111", "reserved": False, "expire_time": 2000, "status": "leased", "server_mkey": 3},
+            {"ip": "10.128.1.112", "reserved": True, "expire_time": 1000, "status": "leased", "server_mkey": 3},
+            {"ip": "10.128.2.110", "reserved": False, "expire_time": 1000, "status": "leased", "server_mkey": 4},
+        ]
+    )
+    assert section.expiring(3, 1500) == 1
+    assert section.expiring(3, 2500) == 2
+    assert section.expiring(5, 2500) == 0
 
 @pytest.mark.parametrize(
     "item, section_fortios_dhcp_scope, section_fortios_dhcp_lease, expected_check_result",
@@ -267,7 +279,8 @@ def test_parse_fortios_dhcp_lease(string_table, expected_section) -> None:
                             vci_string=[],
                             uci_match="disable",
                             uci_string=[],
-                            lease_time=0
+                            lease_time=0,
+                            size=155
                         ),
                     ],
                     timezone_option="disable",
@@ -343,58 +356,77 @@ def test_parse_fortios_dhcp_lease(string_table, expected_section) -> None:
                             description=""
                         ),
                     ],
+                    ip_count=155,
                 ),
             },
-            {
-                "aa:aa:bb:bb:cc:cc": DhcpLease(
-                    ip="10.128.1.110",
-                    reserved=True,
-                    mac="aa:aa:bb:bb:cc:cc",
-                    vci="FortiSwitch-424E-FPOE",
-                    hostname="switch01",
-                    expire_time=1724645153,
-                    status="leased",
-                    interface="fortilink",
-                    type="ipv4",
-                    server_mkey=3,
-                    server_ipam_enabled=False
-                ),
-                "aa:aa:bb:bb:dd:dd": DhcpLease(
-                    ip="10.128.1.111",
-                    reserved=True,
-                    mac="aa:aa:bb:bb:dd:dd",
-                    vci="FortiSwitch-424E-FPOE",
-                    hostname="switch02",
-                    expire_time=1724645151,
-                    status="leased",
-                    interface="fortilink",
-                    type="ipv4",
-                    server_mkey=3,
-                    server_ipam_enabled=False
-                ),
-                "aa:aa:bb:bb:ee:ee": DhcpLease(
-                    ip="10.128.1.112",
-                    reserved=True,
-                    mac="aa:aa:bb:bb:ee:ee",
-                    vci="FortiSwitch-448E-FPOE",
-                    hostname="switch03",
-                    expire_time=1724645152,
-                    status="leased",
-                    interface="fortilink",
-                    type="ipv4",
-                    server_mkey=3,
-                    server_ipam_enabled=False
-                ),
-            },
+            DhcpLeaseSection.from_leases(
+                [
+                    dict(
+                        ip="10.128.1.110",
+                        reserved=True,
+                        mac="aa:aa:bb:bb:cc:cc",
+                        vci="FortiSwitch-424E-FPOE",
+                        hostname="switch01",
+                        expire_time=1724645153,
+                        status="leased",
+                        interface="fortilink",
+                        type="ipv4",
+                        server_mkey=3,
+                        server_ipam_enabled=False
+                    ),
+                    dict(
+                        ip="10.128.1.111",
+                        reserved=True,
+                        mac="aa:aa:bb:bb:dd:dd",
+                        vci="FortiSwitch-424E-FPOE",
+                        hostname="switch02",
+                        expire_time=1724645151,
+                        status="leased",
+                        interface="fortilink",
+                        type="ipv4",
+                        server_mkey=3,
+                        server_ipam_enabled=False
+                    ),
+                    dict(
+                        ip="10.128.1.112",
+                        reserved=True,
+                        mac="aa:aa:bb:bb:ee:ee",
+                        vci="FortiSwitch-448E-FPOE",
+                        hostname="switch03",
+                        expire_time=1724645152,
+                        status="leased",
+                        interface="fortilink",
+                        type="ipv4",
+                        server_mkey=3,
+                        server_ipam_enabled=False
+                    ),
+                ]
+            ),
             [
                 Metric("scope_usage", 3.0, boundaries=(0.0, 155.0)),
                 Result(state=State.OK, summary="Scope usage: 1.94%"),
                 Result(state=State.OK, summary="Status: enable, Interface: fortilink, Total IPs: 155, Leased IPs: 3, Available IPs: 152"),
             ],
         ),
+        (
+            "10.128.1.0/24",
+            {"10.128.1.0/24": DhcpServer.construct(q_origin_key=3, status="enable", interface="fortilink", ip_count=10, ip_range=[IpRange.construct(size=10)])},
+            DhcpLeaseSection.from_leases(
+                [
+                    dict(ip="10.128.1.110", reserved=False, mac="aa:aa:bb:bb:cc:cc", status="conflicted", interface="fortilink", type="ipv4", server_mkey=3, server_ipam_enabled=False),
+                    dict(ip="10.128.1.111", reserved=False, mac="aa:aa:bb:bb:dd:dd", status="leased", interface="fortilink", type="ipv4", server_mkey=3, server_ipam_enabled=False),
+                    dict(ip="10.128.2.110", reserved=False, mac="aa:aa:bb:bb:cc:cc", status="leased", interface="lan", type="ipv4", server_mkey=4, server_ipam_enabled=False),
+                ]
+            ),
+            [
+                Metric("scope_usage", 2.0, boundaries=(0.0, 10.0)),
+                Result(state=State.OK, summary="Scope usage: 20.00%"),
+                Result(state=State.WARN, summary="Status: enable, Interface: fortilink, IP conflicts: 1, Total IPs: 10, Leased IPs: 2, Available IPs: 8", details="Conflicted leases:\nMAC: aa:aa:bb:bb:cc:cc, IP: 10.128.1.110\n"),
+            ],
+        ),
     ],
 )
 
-def test_check_fortios_dhcp_scope(item: str, section_fortios_dhcp_scope: DhcpServer, section_fortios_dhcp_lease: DhcpLease, expected_check_result) -> None:
+def test_check_fortios_dhcp_scope(item: str, section_fortios_dhcp_scope: DhcpServer, section_fortios_dhcp_lease: DhcpLeaseSection, expected_check_result) -> None:
     actual_check_result = list(check_fortios_dhcp_scope(item, DEFAULT_DHCP_LEVELS, section_fortios_dhcp_scope, section_fortios_dhcp_lease))
     assert actual_check_result == expected_check_result
\ No newline at end of file
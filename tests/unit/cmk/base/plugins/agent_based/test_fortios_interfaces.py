@@ -42,8 +42,10 @@ from cmk.base.plugins.agent_based.fortios_interface_cmdb import InterfaceCMDB
         ),
     ],
 )
-def test_parse_fortios_interfaces(string_table, expected_section) -> None:
-    assert parse_fortios_interfaces(string_table) == expected_section
+@pytest.mark.parametrize("validate", [False, True])
+def test_parse_fortios_interfaces(string_table, expected_section, validate: bool) -> None:
+    with patch("cmk.utils.debug.enabled", return_value=validate):
+        assert parse_fortios_interfaces(string_table) == expected_section
 
 
 @pytest.mark.parametrize(
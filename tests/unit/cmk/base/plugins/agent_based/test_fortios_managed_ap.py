@@ -138,8 +138,10 @@ AP_SECTION: dict = {
         ),
     ],
 )
-def test_parse_fortios_managed_ap(string_table, expected_section) -> None:
-    assert parse_fortios_managed_ap(string_table) == expected_section[0]
+@pytest.mark.parametrize("validate", [False, True])
+def test_parse_fortios_managed_ap(string_table, expected_section, validate: bool) -> None:
+    with patch("cmk.utils.debug.enabled", return_value=validate):
+        assert parse_fortios_managed_ap(string_table) == expected_section[0]
 
 
 @pytest.mark.parametrize(
@@ -15,12 +15,14 @@
 # WAGNER AG
 # Developer: opensource@wagner.ch
 
+import json
+
 import pytest
 from cmk.base.plugins.agent_based.fortios_managed_switch_health import (
     FortiosSwitchData,
     parse_fortios_managed_switch_health,
-    replace_hyphens,
 )
+from cmk.base.plugins.agent_based.utils.fortios import loads_normalized
 
 
 @pytest.fixture
@@ -48,22 +50,24 @@ def valid_json():
     }"""
 
 
-def test_replace_hyphens():
+def test_loads_normalized():
     input_data = {
         "performance-status": {
             "cpu": {
                 "cpu_idle": {"cpu-unit": "%", "cpu-value": 86},
-            }
+            },
+            "ports": [{"port-name": "port1"}, "port-2"],
         }
     }
     expected_output = {
         "performance_status": {
             "cpu": {
                 "cpu_idle": {"cpu_unit": "%", "cpu_value": 86},
-            }
+            },
+            "ports": [{"port_name": "port1"}, "port-2"],
         }
     }
-    assert replace_hyphens(input_data) == expected_output
+    assert loads_normalized(json.dumps(input_data)) == expected_output
 
 
 def test_parse_fortios_managed_switch_health(valid_json):
@@ -15,8 +15,10 @@
 # WAGNER AG
 # Developer: opensource@wagner.ch
 
+import json
+import time
 from datetime import datetime, timedelta
-from typing import Dict, Tuple
+from typing import Callable, Dict, Tuple
 from unittest.mock import patch
 
 import pytest
@@ -34,6 +36,8 @@ from cmk.base.plugins.agent_based.fortios_managed_switch_interface import (
 
 DEFAULT_PARAMETERS: Dict = {}
 
+SWITCH01 = '{"switch_port_stats":{"ports":{"internal":{"collisions":0,"crc-alignments":0,"fragments":0,"jabbers":0,"l3packets":0,"rx-bcast":246,"rx-bytes":8022580264,"rx-drops":1,"rx-errors":0,"rx-mcast":4556338,"rx-oversize":0,"rx-packets":20146015,"rx-ucast":15589431,"tx-bcast":69,"tx-bytes":2466784145,"tx-drops":0,"tx-errors":0,"tx-mcast":835246,"tx-oversize":0,"tx-packets":15996955,"tx-ucast":15161640,"undersize":0},"port1":{"collisions":0,"crc-alignments":0,"fragments":0,"jabbers":0,"l3packets":0,"rx-bcast":153,"rx-bytes":2274827037,"rx-drops":89,"rx-errors":0,"rx-mcast":835251,"rx-oversize":0,"rx-packets":15997044,"rx-ucast":15161640,"tx-bcast":245,"tx-bytes":7876205654,"tx-drops":0,"tx-errors":0,"tx-mcast":4556338,"tx-oversize":0,"tx-packets":20146014,"tx-ucast":15589431,"undersize":0},"port2":{"collisions":0,"crc-alignments":0,"fragments":0,"jabbers":0,"l3packets":0,"rx-bcast":0,"rx-bytes":0,"rx-drops":0,"rx-errors":0,"rx-mcast":0,"rx-oversize":0,"rx-packets":0,"rx-ucast":0,"tx-bcast":0,"tx-bytes":0,"tx-drops":0,"tx-errors":0,"tx-mcast":0,"tx-oversize":0,"tx-packets":0,"tx-ucast":0,"undersize":0},"port3":{"collisions":0,"crc-alignments":0,"fragments":0,"jabbers":0,"l3packets":0,"rx-bcast":0,"rx-bytes":0,"rx-drops":0,"rx-errors":0,"rx-mcast":0,"rx-oversize":0,"rx-packets":0,"rx-ucast":0,"tx-bcast":0,"tx-bytes":0,"tx-drops":0,"tx-errors":0,"tx-mcast":0,"tx-oversize":0,"tx-packets":0,"tx-ucast":0,"undersize":0}},"serial":"Serial01"},"switch_ports":{"connecting_from":"10.10.10.10","dhcp_snooping_supported":true,"eos":false,"fgt_peer_intf_name":"fortilink","forticare_registration_status":"registered","igmp_snooping_supported":true,"image_download_progress":0,"is_l3":false,"join_time":"Tue Apr 2 19:08:34 2024","led_blink_supported":true,"max_poe_budget":65,"mc_lag_supported":false,"name":"Switch01","os_version":"OSVersion","ports":[{"dhcp_snooping":{"untrusted":0},"duplex":"full","fgt_peer_device_name":"Serial","fgt_peer_port_name":"internal5","fortilink_port":true,"igmp_snooping_group":{"group_count":0},"interface":"port1","isl_peer_device_name":"","isl_peer_port_name":"","isl_peer_trunk_name":"","mclag":false,"mclag_icl":false,"poe_capable":true,"poe_status":"enabled","port_power":0,"power_status":1,"speed":1000,"status":"up","supported_port_speeds":["10half","10full","100half","100full","auto","1000auto"],"vlan":"LAN"},{"dhcp_snooping":{"untrusted":0},"duplex":"half","fgt_peer_device_name":"","fgt_peer_port_name":"","fortilink_port":false,"igmp_snooping_group":{"group_count":0},"interface":"port2","isl_peer_device_name":"","isl_peer_port_name":"","isl_peer_trunk_name":"","mclag":false,"mclag_icl":false,"poe_capable":true,"poe_status":"enabled","port_power":0,"power_status":1,"speed":10,"status":"up","supported_port_speeds":["10half","10full","100half","100full","auto","1000auto"],"vlan":"LAN"},{"dhcp_snooping":{"untrusted":0},"duplex":"half","fgt_peer_device_name":"","fgt_peer_port_name":"","fortilink_port":false,"igmp_snooping_group":{"group_count":0},"interface":"port3","isl_peer_device_name":"","isl_peer_port_name":"","isl_peer_trunk_name":"","mclag":false,"mclag_icl":false,"poe_capable":true,"poe_status":"enabled","port_power":0,"power_status":1,"speed":10,"status":"up","supported_port_speeds":["10half","10full","100half","100full","auto","1000auto"],"vlan":"LAN"}],"serial":"Serial01","state":"Authorized","status":"Connected","type":"physical","vdom":"root","vlan_segment_lite_supported":true,"vlan_segment_supported":true},"switch_status":{"802-1X-settings":{"link-down-auth":"set-unauth","local-override":"disable","mab-reauth":"disable","max-reauth-attempt":3,"reauth-period":60,"tx-period":30},"access-profile":"default","custom-command":[],"delayed-restart-trigger":0,"description":"Switch","dhcp-server-access-list":"global","dhcp-snooping-static-client":[],"directly-connected":1,"dynamic-capability":"0","dynamically-discovered":1,"firmware-provision":"disable","firmware-provision-latest":"disable","firmware-provision-version":"","flow-identity":"00000000","fsw-wan1-admin":"enable","fsw-wan1-peer":"fortilink","fsw-wan2-admin":"discovered","fsw-wan2-peer":"","igmp-snooping":{"aging-time":300,"flood-unknown-multicast":"disable","local-override":"disable","vlans":[]},"ip-source-guard":[],"l3-discovered":0,"max-allowed-trunk-members":8,"mclag-igmp-snooping-aware":"enable","mirror":[],"name":"Switch01","override-snmp-community":"disable","override-snmp-sysinfo":"disable","override-snmp-trap-threshold":"disable","override-snmp-user":"disable","owner-vdom":"","poe-detection-type":1,"poe-pre-standard-detection":"disable","ports":[{"access-mode":"static","aggregator-mode":"bandwidth","allowed-vlans":[{"q_origin_key":"quarantine","vlan-name":"quarantine"}],"allowed-vlans-all":"disable","arp-inspection-trust":"untrusted","bundle":"disable","description":"","dhcp-snoop-option82-trust":"disable","dhcp-snooping":"untrusted","discard-mode":"none","dsl-profile":"","edge-port":"enable","export-to":"root","export-to-pool":"","export-to-pool-flag":0,"fec-capable":0,"fec-state":"cl91","fgt-peer-device-name":"Serial","fgt-peer-port-name":"internal5","fiber-port":0,"flags":3,"flap-duration":30,"flap-rate":5,"flap-timeout":0,"flapguard":"disable","flow-control":"disable","fortilink-port":1,"igmp-snooping-flood-reports":"disable","interface-tags":[],"ip-source-guard":"disable","isl-local-trunk-name":"","isl-peer-device-name":"","isl-peer-port-name":"","lacp-speed":"slow","learning-limit":0,"lldp-profile":"default-auto-isl","lldp-status":"tx-rx","loop-guard":"disabled","loop-guard-timeout":45,"mac-addr":"00:00:00:00:00:00","matched-dpp-intf-tags":"","matched-dpp-policy":"","max-bundle":24,"mcast-snooping-flood-traffic":"disable","mclag":"disable","mclag-icl-port":0,"media-type":"RJ45","member-withdrawal-behavior":"block","members":[],"min-bundle":1,"mode":"static","p2p-port":0,"packet-sample-rate":512,"packet-sampler":"disabled","pause-meter":0,"pause-meter-resume":"50%","poe-capable":1,"poe-max-power":"30.0W","poe-mode-bt-cabable":0,"poe-port-mode":"ieee802-3at","poe-port-power":"normal","poe-port-priority":"low-priority","poe-pre-standard-detection":"disable","poe-standard":"802.3af/at","poe-status":"enable","port-name":"port1","port-number":0,"port-owner":"","port-policy":"","port-prefix-type":0,"port-security-policy":"","port-selection-criteria":"src-dst-ip","ptp-policy":"default","q_origin_key":"port1","qos-policy":"default","rpvst-port":"disabled","sample-direction":"both","sflow-counter-interval":0,"speed":"auto","speed-mask":207,"stacking-port":0,"status":"up","sticky-mac":"disable","storm-control-policy":"default","stp-bpdu-guard":"disabled","stp-bpdu-guard-timeout":5,"stp-root-guard":"disabled","stp-state":"enabled","switch-id":"Serial01","trunk-member":0,"type":"physical","untagged-vlans":[{"q_origin_key":"quarantine","vlan-name":"quarantine"}],"virtual-port":0,"vlan":"LAN"},{"access-mode":"static","aggregator-mode":"bandwidth","allowed-vlans":[{"q_origin_key":"quarantine","vlan-name":"quarantine"}],"allowed-vlans-all":"disable","arp-inspection-trust":"untrusted","bundle":"disable","description":"","dhcp-snoop-option82-trust":"disable","dhcp-snooping":"untrusted","discard-mode":"none","dsl-profile":"","edge-port":"enable","export-to":"root","export-to-pool":"","export-to-pool-flag":0,"fec-capable":0,"fec-state":"cl91","fgt-peer-device-name":"","fgt-peer-port-name":"","fiber-port":0,"flags":2,"flap-duration":30,"flap-rate":5,"flap-timeout":0,"flapguard":"disable","flow-control":"disable","fortilink-port":0,"igmp-snooping-flood-reports":"disable","interface-tags":[],"ip-source-guard":"disable","isl-local-trunk-name":"","isl-peer-device-name":"","isl-peer-port-name":"","lacp-speed":"slow","learning-limit":0,"lldp-profile":"default-auto-isl","lldp-status":"tx-rx","loop-guard":"disabled","loop-guard-timeout":45,"mac-addr":"00:00:00:00:00:00","matched-dpp-intf-tags":"","matched-dpp-policy":"","max-bundle":24,"mcast-snooping-flood-traffic":"disable","mclag":"disable","mclag-icl-port":0,"media-type":"RJ45","member-withdrawal-behavior":"block","members":[],"min-bundle":1,"mode":"static","p2p-port":0,"packet-sample-rate":512,"packet-sampler":"disabled","pause-meter":0,"pause-meter-resume":"50%","poe-capable":1,"poe-max-power":"30.0W","poe-mode-bt-cabable":0,"poe-port-mode":"ieee802-3at","poe-port-power":"normal","poe-port-priority":"low-priority","poe-pre-standard-detection":"disable","poe-standard":"802.3af/at","poe-status":"enable","port-name":"port2","port-number":0,"port-owner":"","port-policy":"","port-prefix-type":0,"port-security-policy":"","port-selection-criteria":"src-dst-ip","ptp-policy":"default","q_origin_key":"port2","qos-policy":"default","rpvst-port":"disabled","sample-direction":"both","sflow-counter-interval":0,"speed":"auto","speed-mask":207,"stacking-port":0,"status":"up","sticky-mac":"disable","storm-control-policy":"default","stp-bpdu-guard":"disabled","stp-bpdu-guard-timeout":5,"stp-root-guard":"disabled","stp-state":"enabled","switch-id":"Serial01","trunk-member":0,"type":"physical","untagged-vlans":[{"q_origin_key":"quarantine","vlan-name":"quarantine"}],"virtual-port":0,"vlan":"LAN"},{"access-mode":"static","aggregator-mode":"bandwidth","allowed-vlans":[{"q_origin_key":"quarantine","vlan-name":"quarantine"}],"allowed-vlans-all":"disable","arp-inspection-trust":"untrusted","bundle":"disable","description":"","dhcp-snoop-option82-trust":"disable","dhcp-snooping":"untrusted","discard-mode":"none","dsl-profile":"","edge-port":"enable","export-to":"root","export-to-pool":"","export-to-pool-flag":0,"fec-capable":0,"fec-state":"cl91","fgt-peer-device-name":"","fgt-peer-port-name":"","fiber-port":0,"flags":2,"flap-duration":30,"flap-rate":5,"flap-timeout":0,"flapguard":"disable","flow-control":"disable","fortilink-port":0,"igmp-snooping-flood-reports":"disable","interface-tags":[],"ip-source-guard":"disable","isl-local-trunk-name":"","isl-peer-device-name":"","isl-peer-port-name":"","lacp-speed":"slow","learning-limit":0,"lldp-profile":"default-auto-isl","lldp-status":"tx-rx","loop-guard":"disabled","loop-guard-timeout":45,"mac-addr":"00:00:00:00:00:00","matched-dpp-intf-tags":"","matched-dpp-policy":"","max-bundle":24,"mcast-snooping-flood-traffic":"disable","mclag":"disable","mclag-icl-port":0,"media-type":"RJ45","member-withdrawal-behavior":"block","members":[],"min-bundle":1,"mode":"static","p2p-port":0,"packet-sample-rate":512,"packet-sampler":"disabled","pause-meter":0,"pause-meter-resume":"50%","poe-capable":1,"poe-max-power":"30.0W","poe-mode-bt-cabable":0,"poe-port-mode":"ieee802-3at","poe-port-power":"normal","poe-port-priority":"low-priority","poe-pre-standard-detection":"disable","poe-standard":"802.3af/at","poe-status":"enable","port-name":"port3","port-number":0,"port-owner":"","port-policy":"","port-prefix-type":0,"port-security-policy":"","port-selection-criteria":"src-dst-ip","ptp-policy":"default","q_origin_key":"port3","qos-policy":"default","rpvst-port":"disabled","sample-direction":"both","sflow-counter-interval":0,"speed":"auto","speed-mask":207,"stacking-port":0,"status":"up","sticky-mac":"disable","storm-control-policy":"default","stp-bpdu-guard":"disabled","stp-bpdu-guard-timeout":5,"stp-root-guard":"disabled","stp-state":"enabled","switch-id":"Serial01","trunk-member":0,"type":"physical","untagged-vlans":[{"q_origin_key":"quarantine","vlan-name":"quarantine"}],"virtual-port":0,"vlan":"LAN"}],"pre-provisioned":0,"q_origin_key":"Serial01","qos-drop-policy":"taildrop","qos-red-probability":12,"remote-log":[],"snmp-community":[],"snmp-sysinfo":{"contact-info":"","description":"","engine-id":"","location":"","status":"disable"},"snmp-trap-threshold":{"trap-high-cpu-threshold":80,"trap-log-full-threshold":90,"trap-low-memory-threshold":80},"snmp-user":[],"staged-image-version":"","static-mac":[],"storm-control":{"broadcast":"disable","local-override":"disable","rate":500,"unknown-multicast":"disable","unknown-unicast":"disable"},"stp-instance":[],"stp-settings":{"forward-time":15,"hello-time":2,"local-override":"disable","max-age":20,"max-hops":20,"name":"","pending-timer":4,"revision":0,"status":"enable"},"switch-device-tag":"","switch-dhcp_opt43_key":"","switch-id":"Serial01","switch-log":{"local-override":"disable","severity":"notification","status":"enable"},"switch-profile":"default","switch-stp-settings":{"status":"enable"},"tdr-supported":"yes","type":"physical","version":1}}'
+
 
 @pytest.mark.parametrize(
     "string_table, expected_section",
@@ -41,7 +45,7 @@ DEFAULT_PARAMETERS: Dict = {}
         (
             [
                 [
-                    '{"switch_port_stats":{"ports":{"internal":{"collisions":0,"crc-alignments":0,"fragments":0,"jabbers":0,"l3packets":0,"rx-bcast":246,"rx-bytes":8022580264,"rx-drops":1,"rx-errors":0,"rx-mcast":4556338,"rx-oversize":0,"rx-packets":20146015,"rx-ucast":15589431,"tx-bcast":69,"tx-bytes":2466784145,"tx-drops":0,"tx-errors":0,"tx-mcast":835246,"tx-oversize":0,"tx-packets":15996955,"tx-ucast":15161640,"undersize":0},"port1":{"collisions":0,"crc-alignments":0,"fragments":0,"jabbers":0,"l3packets":0,"rx-bcast":153,"rx-bytes":2274827037,"rx-drops":89,"rx-errors":0,"rx-mcast":835251,"rx-oversize":0,"rx-packets":15997044,"rx-ucast":15161640,"tx-bcast":245,"tx-bytes":7876205654,"tx-drops":0,"tx-errors":0,"tx-mcast":4556338,"tx-oversize":0,"tx-packets":20146014,"tx-ucast":15589431,"undersize":0},"port2":{"collisions":0,"crc-alignments":0,"fragments":0,"jabbers":0,"l3packets":0,"rx-bcast":0,"rx-bytes":0,"rx-drops":0,"rx-errors":0,"rx-mcast":0,"rx-oversize":0,"rx-packets":0,"rx-ucast":0,"tx-bcast":0,"tx-bytes":0,"tx-drops":0,"tx-errors":0,"tx-mcast":0,"tx-oversize":0,"tx-packets":0,"tx-ucast":0,"undersize":0},"port3":{"collisions":0,"crc-alignments":0,"fragments":0,"jabbers":0,"l3packets":0,"rx-bcast":0,"rx-bytes":0,"rx-drops":0,"rx-errors":0,"rx-mcast":0,"rx-oversize":0,"rx-packets":0,"rx-ucast":0,"tx-bcast":0,"tx-bytes":0,"tx-drops":0,"tx-errors":0,"tx-mcast":0,"tx-oversize":0,"tx-packets":0,"tx-ucast":0,"undersize":0}},"serial":"Serial01"},"switch_ports":{"connecting_from":"10.10.10.10","dhcp_snooping_supported":true,"eos":false,"fgt_peer_intf_name":"fortilink","forticare_registration_status":"registered","igmp_snooping_supported":true,"image_download_progress":0,"is_l3":false,"join_time":"Tue Apr 2 19:08:34 2024","led_blink_supported":true,"max_poe_budget":65,"mc_lag_supported":false,"name":"Switch01","os_version":"OSVersion","ports":[{"dhcp_snooping":{"untrusted":0},"duplex":"full","fgt_peer_device_name":"Serial","fgt_peer_port_name":"internal5","fortilink_port":true,"igmp_snooping_group":{"group_count":0},"interface":"port1","isl_peer_device_name":"","isl_peer_port_name":"","isl_peer_trunk_name":"","mclag":false,"mclag_icl":false,"poe_capable":true,"poe_status":"enabled","port_power":0,"power_status":1,"speed":1000,"status":"up","supported_port_speeds":["10half","10full","100half","100full","auto","1000auto"],"vlan":"LAN"},{"dhcp_snooping":{"untrusted":0},"duplex":"half","fgt_peer_device_name":"","fgt_peer_port_name":"","fortilink_port":false,"igmp_snooping_group":{"group_count":0},"interface":"port2","isl_peer_device_name":"","isl_peer_port_name":"","isl_peer_trunk_name":"","mclag":false,"mclag_icl":false,"poe_capable":true,"poe_status":"enabled","port_power":0,"power_status":1,"speed":10,"status":"up","supported_port_speeds":["10half","10full","100half","100full","auto","1000auto"],"vlan":"LAN"},{"dhcp_snooping":{"untrusted":0},"duplex":"half","fgt_peer_device_name":"","fgt_peer_port_name":"","fortilink_port":false,"igmp_snooping_group":{"group_count":0},"interface":"port3","isl_peer_device_name":"","isl_peer_port_name":"","isl_peer_trunk_name":"","mclag":false,"mclag_icl":false,"poe_capable":true,"poe_status":"enabled","port_power":0,"power_status":1,"speed":10,"status":"up","supported_port_speeds":["10half","10full","100half","100full","auto","1000auto"],"vlan":"LAN"}],"serial":"Serial01","state":"Authorized","status":"Connected","type":"physical","vdom":"root","vlan_segment_lite_supported":true,"vlan_segment_supported":true},"switch_status":{"802-1X-settings":{"link-down-auth":"set-unauth","local-override":"disable","mab-reauth":"disable","max-reauth-attempt":3,"reauth-period":60,"tx-period":30},"access-profile":"default","custom-command":[],"delayed-restart-trigger":0,"description":"Switch","dhcp-server-access-list":"global","dhcp-snooping-static-client":[],"directly-connected":1,"dynamic-capability":"0","dynamically-discovered":1,"firmware-provision":"disable","firmware-provision-latest":"disable","firmware-provision-version":"","flow-identity":"00000000","fsw-wan1-admin":"enable","fsw-wan1-peer":"fortilink","fsw-wan2-admin":"discovered","fsw-wan2-peer":"","igmp-snooping":{"aging-time":300,"flood-unknown-multicast":"disable","local-override":"disable","vlans":[]},"ip-source-guard":[],"l3-discovered":0,"max-allowed-trunk-members":8,"mclag-igmp-snooping-aware":"enable","mirror":[],"name":"Switch01","override-snmp-community":"disable","override-snmp-sysinfo":"disable","override-snmp-trap-threshold":"disable","override-snmp-user":"disable","owner-vdom":"","poe-detection-type":1,"poe-pre-standard-detection":"disable","ports":[{"access-mode":"static","aggregator-mode":"bandwidth","allowed-vlans":[{"q_origin_key":"quarantine","vlan-name":"quarantine"}],"allowed-vlans-all":"disable","arp-inspection-trust":"untrusted","bundle":"disable","description":"","dhcp-snoop-option82-trust":"disable","dhcp-snooping":"untrusted","discard-mode":"none","dsl-profile":"","edge-port":"enable","export-to":"root","export-to-pool":"","export-to-pool-flag":0,"fec-capable":0,"fec-state":"cl91","fgt-peer-device-name":"Serial","fgt-peer-port-name":"internal5","fiber-port":0,"flags":3,"flap-duration":30,"flap-rate":5,"flap-timeout":0,"flapguard":"disable","flow-control":"disable","fortilink-port":1,"igmp-snooping-flood-reports":"disable","interface-tags":[],"ip-source-guard":"disable","isl-local-trunk-name":"","isl-peer-device-name":"","isl-peer-port-name":"","lacp-speed":"slow","learning-limit":0,"lldp-profile":"default-auto-isl","lldp-status":"tx-rx","loop-guard":"disabled","loop-guard-timeout":45,"mac-addr":"00:00:00:00:00:00","matched-dpp-intf-tags":"","matched-dpp-policy":"","max-bundle":24,"mcast-snooping-flood-traffic":"disable","mclag":"disable","mclag-icl-port":0,"media-type":"RJ45","member-withdrawal-behavior":"block","members":[],"min-bundle":1,"mode":"static","p2p-port":0,"packet-sample-rate":512,"packet-sampler":"disabled","pause-meter":0,"pause-meter-resume":"50%","poe-capable":1,"poe-max-power":"30.0W","poe-mode-bt-cabable":0,"poe-port-mode":"ieee802-3at","poe-port-power":"normal","poe-port-priority":"low-priority","poe-pre-standard-detection":"disable","poe-standard":"802.3af/at","poe-status":"enable","port-name":"port1","port-number":0,"port-owner":"","port-policy":"","port-prefix-type":0,"port-security-policy":"","port-selection-criteria":"src-dst-ip","ptp-policy":"default","q_origin_key":"port1","qos-policy":"default","rpvst-port":"disabled","sample-direction":"both","sflow-counter-interval":0,"speed":"auto","speed-mask":207,"stacking-port":0,"status":"up","sticky-mac":"disable","storm-control-policy":"default","stp-bpdu-guard":"disabled","stp-bpdu-guard-timeout":5,"stp-root-guard":"disabled","stp-state":"enabled","switch-id":"Serial01","trunk-member":0,"type":"physical","untagged-vlans":[{"q_origin_key":"quarantine","vlan-name":"quarantine"}],"virtual-port":0,"vlan":"LAN"},{"access-mode":"static","aggregator-mode":"bandwidth","allowed-vlans":[{"q_origin_key":"quarantine","vlan-name":"quarantine"}],"allowed-vlans-all":"disable","arp-inspection-trust":"untrusted","bundle":"disable","description":"","dhcp-snoop-option82-trust":"disable","dhcp-snooping":"untrusted","discard-mode":"none","dsl-profile":"","edge-port":"enable","export-to":"root","export-to-pool":"","export-to-pool-flag":0,"fec-capable":0,"fec-state":"cl91","fgt-peer-device-name":"","fgt-peer-port-name":"","fiber-port":0,"flags":2,"flap-duration":30,"flap-rate":5,"flap-timeout":0,"flapguard":"disable","flow-control":"disable","fortilink-port":0,"igmp-snooping-flood-reports":"disable","interface-tags":[],"ip-source-guard":"disable","isl-local-trunk-name":"","isl-peer-device-name":"","isl-peer-port-name":"","lacp-speed":"slow","learning-limit":0,"lldp-profile":"default-auto-isl","lldp-status":"tx-rx","loop-guard":"disabled","loop-guard-timeout":45,"mac-addr":"00:00:00:00:00:00","matched-dpp-intf-tags":"","matched-dpp-policy":"","max-bundle":24,"mcast-snooping-flood-traffic":"disable","mclag":"disable","mclag-icl-port":0,"media-type":"RJ45","member-withdrawal-behavior":"block","members":[],"min-bundle":1,"mode":"static","p2p-port":0,"packet-sample-rate":512,"packet-sampler":"disabled","pause-meter":0,"pause-meter-resume":"50%","poe-capable":1,"poe-max-power":"30.0W","poe-mode-bt-cabable":0,"poe-port-mode":"ieee802-3at","poe-port-power":"normal","poe-port-priority":"low-priority","poe-pre-standard-detection":"disable","poe-standard":"802.3af/at","poe-status":"enable","port-name":"port2","port-number":0,"port-owner":"","port-policy":"","port-prefix-type":0,"port-security-policy":"","port-selection-criteria":"src-dst-ip","ptp-policy":"default","q_origin_key":"port2","qos-policy":"default","rpvst-port":"disabled","sample-direction":"both","sflow-counter-interval":0,"speed":"auto","speed-mask":207,"stacking-port":0,"status":"up","sticky-mac":"disable","storm-control-policy":"default","stp-bpdu-guard":"disabled","stp-bpdu-guard-timeout":5,"stp-root-guard":"disabled","stp-state":"enabled","switch-id":"Serial01","trunk-member":0,"type":"physical","untagged-vlans":[{"q_origin_key":"quarantine","vlan-name":"quarantine"}],"virtual-port":0,"vlan":"LAN"},{"access-mode":"static","aggregator-mode":"bandwidth","allowed-vlans":[{"q_origin_key":"quarantine","vlan-name":"quarantine"}],"allowed-vlans-all":"disable","arp-inspection-trust":"untrusted","bundle":"disable","description":"","dhcp-snoop-option82-trust":"disable","dhcp-snooping":"untrusted","discard-mode":"none","dsl-profile":"","edge-port":"enable","export-to":"root","export-to-pool":"","export-to-pool-flag":0,"fec-capable":0,"fec-state":"cl91","fgt-peer-device-name":"","fgt-peer-port-name":"","fiber-port":0,"flags":2,"flap-duration":30,"flap-rate":5,"flap-timeout":0,"flapguard":"disable","flow-control":"disable","fortilink-port":0,"igmp-snooping-flood-reports":"disable","interface-tags":[],"ip-source-guard":"disable","isl-local-trunk-name":"","isl-peer-device-name":"","isl-peer-port-name":"","lacp-speed":"slow","learning-limit":0,"lldp-profile":"default-auto-isl","lldp-status":"tx-rx","loop-guard":"disabled","loop-guard-timeout":45,"mac-addr":"00:00:00:00:00:00","matched-dpp-intf-tags":"","matched-dpp-policy":"","max-bundle":24,"mcast-snooping-flood-traffic":"disable","mclag":"disable","mclag-icl-port":0,"media-type":"RJ45","member-withdrawal-behavior":"block","members":[],"min-bundle":1,"mode":"static","p2p-port":0,"packet-sample-rate":512,"packet-sampler":"disabled","pause-meter":0,"pause-meter-resume":"50%","poe-capable":1,"poe-max-power":"30.0W","poe-mode-bt-cabable":0,"poe-port-mode":"ieee802-3at","poe-port-power":"normal","poe-port-priority":"low-priority","poe-pre-standard-detection":"disable","poe-standard":"802.3af/at","poe-status":"enable","port-name":"port3","port-number":0,"port-owner":"","port-policy":"","port-prefix-type":0,"port-security-policy":"","port-selection-criteria":"src-dst-ip","ptp-policy":"default","q_origin_key":"port3","qos-policy":"default","rpvst-port":"disabled","sample-direction":"both","sflow-counter-interval":0,"speed":"auto","speed-mask":207,"stacking-port":0,"status":"up","sticky-mac":"disable","storm-control-policy":"default","stp-bpdu-guard":"disabled","stp-bpdu-guard-timeout":5,"stp-root-guard":"disabled","stp-state":"enabled","switch-id":"Serial01","trunk-member":0,"type":"physical","untagged-vlans":[{"q_origin_key":"quarantine","vlan-name":"quarantine"}],"virtual-port":0,"vlan":"LAN"}],"pre-provisioned":0,"q_origin_key":"Serial01","qos-drop-policy":"taildrop","qos-red-probability":12,"remote-log":[],"snmp-community":[],"snmp-sysinfo":{"contact-info":"","description":"","engine-id":"","location":"","status":"disable"},"snmp-trap-threshold":{"trap-high-cpu-threshold":80,"trap-log-full-threshold":90,"trap-low-memory-threshold":80},"snmp-user":[],"staged-image-version":"","static-mac":[],"storm-control":{"broadcast":"disable","local-override":"disable","rate":500,"unknown-multicast":"disable","unknown-unicast":"disable"},"stp-instance":[],"stp-settings":{"forward-time":15,"hello-time":2,"local-override":"disable","max-age":20,"max-hops":20,"name":"","pending-timer":4,"revision":0,"status":"enable"},"switch-device-tag":"","switch-dhcp_opt43_key":"","switch-id":"Serial01","switch-log":{"local-override":"disable","severity":"notification","status":"enable"},"switch-profile":"default","switch-stp-settings":{"status":"enable"},"tdr-supported":"yes","type":"physical","version":1}}'
+                    SWITCH01,
                 ]
             ],
             [
@@ -387,8 +391,10 @@ DEFAULT_PARAMETERS: Dict = {}
         ),
     ],
 )
-def test_parse_fortios_managed_switch_interface(string_table, expected_section) -> None:
-    assert parse_fortios_switch_interface(string_table) == expected_section[0]
+@pytest.mark.parametrize("validate", [False, True])
+def test_parse_fortios_managed_switch_interface(string_table, expected_section, validate: bool) -> None:
+    with patch("cmk.utils.debug.enabled", return_value=validate):
+        assert parse_fortios_switch_interface(string_table) == expected_section[0]
 
 
 @pytest.mark.parametrize(
@@ -535,3 +541,50 @@ def test_check_fortios_managed_switch_interface(item: str, section: str, expecte
         result = list(check_fortios_switch_interface(item, section))
         for res, expected_res in zip(result, expected_check_result):
             assert res == expected_res
+
+
+@pytest.fixture(name="switch_stack")
+def fixture_switch_stack() -> Callable[[int, int], str]:
+    """Agent output of a stack of switches with the given number of ports each, built from port2 of SWITCH01"""
+    switch = json.loads(SWITCH01)
+    stats = switch["switch_port_stats"]["ports"]["port2"]
+    port = next(port for port in switch["switch_ports"]["ports"] if port["interface"] == "port2")
+    status = next(port for port in switch["switch_status"]["ports"] if port["port-name"] == "port2")
+
+    def build(switches: int, ports: int) -> str:
+        names = [f"port{index}" for index in range(1, switches * ports + 1)]
+        stack = {
+            "switch_port_stats": {"ports": {name: {**stats, "rx-bytes": index} for index, name in enumerate(names)}, "serial": "Serial01"},
+            "switch_ports": {**switch["switch_ports"], "ports": [{**port, "interface": name} for name in names]},
+            # the status does not list the ports in the same order
+            "switch_status": {**switch["switch_status"], "ports": [{**status, "port-name": name, "q_origin_key": name} for name in reversed(names)]},
+        }
+        return json.dumps(stack)
+
+    return build
+
+
+@pytest.mark.parametrize("switches", [1, 8])
+def test_parse_fortios_switch_interface_stack(switch_stack, switches: int) -> None:
+    section = parse_fortios_switch_interface([[switch_stack(switches, 48)]])
+    port = parse_fortios_switch_interface([[SWITCH01]])["port2"]
+
+    assert len(section) == switches * 48
+    for index, name in enumerate(section):
+        assert section[name] == port.copy(update={"port_name": name, "q_origin_key": name, "interface": name, "rx_bytes": int(name[4:]) - 1})
+        assert index == len(section) - int(name[4:])
+
+
+@pytest.mark.benchmark
+def test_parse_fortios_switch_interface_scaling(switch_stack) -> None:
+    def parse_time(switches: int) -> float:
+        string_table = [[switch_stack(switches, 48)]]
+        durations = []
+        for _ in range(3):
+            start = time.perf_counter()
+            parse_fortios_switch_interface(string_table)
+            durations.append(time.perf_counter() - start)
+        return min(durations)
+
+    # 16 times the ports, a join that scans all ports per port would take about 256 times as long
+    assert parse_time(16) < 64 * parse_time(1)
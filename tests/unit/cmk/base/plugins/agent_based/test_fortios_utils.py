@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+# -*- encoding: utf-8; py-indent-offset: 4 -*-
+
+# This is free software;  you can redistribute it and/or modify it
+# under the  terms of the  GNU General Public License  as published by
+# the Free Software Foundation in version 2.  check_mk is  distributed
+# in the hope that it will be useful, but WITHOUT ANY WARRANTY;  with-
+# out even the implied warranty of  MERCHANTABILITY  or  FITNESS FOR A
+# PARTICULAR PURPOSE. See the  GNU General Public License for more de-
+# tails. You should have  received  a copy of the  GNU  General Public
+# License along with GNU Make; see the file  COPYING.  If  not,  write
+# to the Free Software Foundation, Inc., 51 Franklin St,  Fifth Floor,
+# Boston, MA 02110-1301 USA.
+
+# WAGNER AG
+# Developer: opensource@wagner.ch
+
+from typing import List, Optional
+
+import pytest
+from cmk.base.plugins.agent_based.utils.fortios import construct_model
+from pydantic import BaseModel, ValidationError
+
+
+class Port(BaseModel):
+    name: str
+    enabled: bool
+    speed: int
+    load: float
+
+
+class Switch(BaseModel):
+    serial: str
+    vlan: Optional[int]
+    ports: List[Port]
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        {"serial": "S1", "vlan": None, "ports": [{"name": "port1", "enabled": True, "speed": 1000, "load": 0.5}]},
+        {"serial": 42, "vlan": "10", "ports": [{"name": "port1", "enabled": "yes", "speed": "1000", "load": "1.5"}]},
+        {"serial": "S1", "vlan": 1.0, "ports": [{"name": "port1", "enabled": "False", "speed": 100.0, "load": 1}]},
+        {"serial": "S1", "ports": [{"name": "port1", "enabled": 0, "speed": 10, "load": 0, "unknown": "dropped"}]},
+    ],
+)
+def test_construct_model_like_validation(data) -> None:
+    constructed = construct_model(Switch, data)
+    validated = Switch.parse_obj(data)
+    assert constructed == validated
+    assert [type(port.enabled) for port in constructed.ports] == [type(port.enabled) for port in validated.ports]
+
+
+@pytest.mark.parametrize(
+    "port",
+    [
+        {"name": "port1", "enabled": "disable", "speed": 1000, "load": 0.0},
+        {"name": "port1", "enabled": True, "speed": "1.5", "load": 0.0},
+        {"name": "port1", "enabled": True, "speed": 1000, "load": [0.0]},
+        {"name": ["port1"], "enabled": True, "speed": 1000, "load": 0.0},
+    ],
+)
+def test_construct_model_rejects_like_validation(port) -> None:
+    with pytest.raises(ValidationError):
+        construct_model(Switch, {"serial": "S1", "vlan": None, "ports": [port]})
@@ -31,7 +31,7 @@ from cmk.gui.plugins.wato.utils import (
     IndividualOrStoredPassword,
     rulespec_registry,
 )
-from cmk.gui.valuespec import Alternative, Dictionary, FixedValue, Integer, NetworkPort, TextInput
+from cmk.gui.valuespec import Alternative, CascadingDropdown, Dictionary, DropdownChoice, FixedValue, Integer, ListChoice, NetworkPort, TextInput
 
 
 def tls_verify_options() -> tuple[Literal["ssl"], Alternative]:
@@ -88,6 +88,28 @@ def tls_verify_flag_default_no() -> tuple[Literal["verify-cert"], Alternative]:
     )
 
 
+def _section_choices() -> list[tuple[str, str]]:
+    return [
+        ("license", _("License")),
+        ("ntp", _("NTP")),
+        ("ipsec", _("IPsec tunnels")),
+        ("uptime", _("Uptime")),
+        ("ha_history", _("HA history")),
+        ("ha_peer", _("HA peers")),
+        ("interfaces", _("Interfaces")),
+        ("interfaces_cmdb", _("Interface configuration")),
+        ("vdom_resources", _("VDOM resources")),
+        ("bgp_peer", _("BGP peers")),
+        ("device_info", _("Device information")),
+        ("sslvpn", _("SSL VPN")),
+        ("managed_switch", _("Managed FortiSwitches (piggyback)")),
+        ("managed_ap", _("Managed access points")),
+        ("dhcp_scope", _("DHCP scopes")),
+        ("dhcp_lease", _("DHCP leases")),
+        ("sensors", _("Hardware sensors")),
+    ]
+
+
 def _valuespec_special_agents_fortios():
     return Dictionary(
         title=_("FortiOS"),
@@ -111,8 +133,80 @@ def _valuespec_special_agents_fortios():
             ),
             tls_verify_options(),
             ("timeout", Integer(title=_("Timeout"), minvalue=1, default_value=10)),
+            (
+                "workers",
+                Integer(
+                    title=_("Parallel requests"),
+                    help=_("Number of REST API requests the special agent sends to the FortiGate at the same time. Set to 1 to collect the sections one after another."),
+                    minvalue=1,
+                    maxvalue=32,
+                    default_value=4,
+                ),
+            ),
+            (
+                "backend",
+                DropdownChoice(
+                    title=_("Collection backend"),
+                    help=_("Send the parallel requests from a pool of threads or from a single asyncio event loop. The asyncio backend needs less memory when many special agents run at the same time."),
+                    choices=[
+                        ("threads", _("Thread pool")),
+                        ("asyncio", _("asyncio event loop")),
+                    ],
+                    default_value="threads",
+                ),
+            ),
+            (
+                "deadline",
+                Integer(
+                    title=_("Overall time budget"),
+                    help=_("Maximum time in seconds for collecting all sections. High priority sections such as HA, IPsec and interfaces are requested first, sections not collected in time are served from the agent cache or dropped and reported by the 'FortiOS agent deadline' service."),
+                    minvalue=1,
+                    unit=_("seconds"),
+                ),
+            ),
+            (
+                "sections",
+                CascadingDropdown(
+                    title=_("Sections to collect"),
+                    help=_("Restrict the REST API requests to the sections you monitor, by default all sections are collected. Unselected sections are neither requested nor shown by the agent."),
+                    choices=[
+                        ("only", _("Collect only these sections"), ListChoice(choices=_section_choices(), allow_empty=False)),
+                        ("skip", _("Collect all sections except these"), ListChoice(choices=_section_choices(), allow_empty=False)),
+                    ],
+                ),
+            ),
+            (
+                "page_size",
+                Integer(
+                    title=_("Page size of large tables"),
+                    help=_("Large tables such as the DHCP leases, the managed access points and the interface configuration are requested in pages of this many entries, so the FortiGate never has to build a huge response at once. The pages of the DHCP leases and the access points are written to the agent output as they arrive. Set to 0 to request each table in a single response."),
+                    minvalue=0,
+                    unit=_("entries"),
+                    default_value=1000,
+                ),
+            ),
+            (
+                "spool",
+                Dictionary(
+                    title=_("Read from the collector daemon"),
+                    help=_("Print the spool file written by 'agent_fortios --daemon' for this host instead of querying the FortiGate. The data is collected directly if the spool file is missing or too old."),
+                    elements=[
+                        ("directory", TextInput(title=_("Spool directory"), allow_empty=False)),
+                        (
+                            "max_age",
+                            Integer(
+                                title=_("Maximum age of the spool file"),
+                                minvalue=1,
+                                unit=_("seconds"),
+                                default_value=300,
+                            ),
+                        ),
+                    ],
+                    optional_keys=["max_age"],
+                ),
+            ),
         ],
-        optional_keys=["timeout"],
+        optional_keys=["timeout", "workers", "backend", "deadline", "sections", "page_size", "spool"],
     )
 
 
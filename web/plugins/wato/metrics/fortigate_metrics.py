@@ -34,4 +34,34 @@ metric_info["fortigate_ap_memory_util"] = {
     "title": _l("AP Memory utilization"),
     "unit": "%",
     "color": "26/a",
-}
\ No newline at end of file
+}
+
+metric_info["fortios_agent_elapsed"] = {
+    "title": _("Agent collection time"),
+    "unit": "s",
+    "color": "31/a",
+}
+
+metric_info["fortios_api_latency"] = {
+    "title": _("REST API latency"),
+    "unit": "s",
+    "color": "11/a",
+}
+
+metric_info["fortios_api_wire_bytes"] = {
+    "title": _("REST API bytes received"),
+    "unit": "bytes",
+    "color": "21/a",
+}
+
+metric_info["fortios_api_body_bytes"] = {
+    "title": _("REST API bytes decoded"),
+    "unit": "bytes",
+    "color": "23/a",
+}
+
+metric_info["fortios_api_decode_time"] = {
+    "title": _("REST API JSON decode time"),
+    "unit": "s",
+    "color": "41/a",
+}